@@ -1,28 +1,97 @@
+import csv
+import itertools
+import logging
 import random
 import sqlite3
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 import os
+import threading
+import time
 import bcrypt
 
+from classes.Cennik import *
+from classes.DziennikZapytan import *
+from classes.GeneratorDanych import *
+from classes.KolejkaParagonow import *
 from classes.Klient import *
+from classes.MagistralaZdarzen import *
 from classes.OpaskaNFC import *
+from classes.PamiecRaportow import *
+from classes.Pomiary import *
+from classes.PulaOpasek import *
+from classes.PulaPolaczen import *
 from classes.Raport import *
 from classes.Recepcjonista import *
 from classes.Transakcja import *
+from classes.Zapytania import *
 
 class SystemObslugi:
-    def __init__(self):
+    # Co ile sekund liczniki w pamięci są uzgadniane z bazą danych
+    OKRES_UZGADNIANIA_LICZNIKOW = 300
+    # Liczba wierszy importu zapisywanych jedną transakcją
+    ROZMIAR_PACZKI_IMPORTU = 5000
+    # Ile odrzuconych wierszy opisywać w podsumowaniu importu
+    MAKS_OPISANYCH_ODRZUCEN = 1000
+    # Współczynnik kosztu bcrypt (2^koszt rund); każdy +1 podwaja czas logowania
+    KOSZT_HASLA = 12
+    # Zapytania wolniejsze niż próg (ms) trafiają do dziennika wolnych zapytań z planem wykonania
+    PROG_WOLNEGO_ZAPYTANIA_MS = 100
+
+    def __init__(self, koszt_hasla=None, zegar=None):
         self.wersja_systemu = "1.0"
+        self.koszt_hasla = koszt_hasla or self.KOSZT_HASLA
+        # Źródło bieżącego czasu; symulacja podstawia tu własny zegar
+        self.zegar = zegar or datetime.now
         self.status_systemu = "aktywny"
+        self.pula_polaczen = None
         self.conn = None
         self.zalogowany_pracownik = None
-
+        self.cennik = Cennik()
+        self.pula_opasek = PulaOpasek()
+        self.kolejka_paragonow = KolejkaParagonow()
+        self.zdarzenia = MagistralaZdarzen()
+        # Przez system - podmiana self.zegar obejmuje też pamięć raportów
+        self.pamiec_raportow = PamiecRaportow(zegar=lambda: self.zegar())
+        self.pomiary = Pomiary()
+        self.zdarzenia.subskrybuj(ZDARZENIE_PLATNOSC_ZAREJESTROWANA, self._po_platnosci)
+        self.liczba_klientow = 0
+        self.aktywne_opaski = 0
+        self._ostatnie_uzgodnienie = None
+        self._blokada_licznikow = threading.Lock()
+        self._watek = threading.local()
+
+    @property
+    def conn(self):
+        # Jawnie ustawione połączenie ma pierwszeństwo przed pulą (np. w testach)
+        if self._conn is not None:
+            return self._conn
+        if self.pula_polaczen is not None:
+            return self.pula_polaczen.polaczenie()
+        return None
+
+    @conn.setter
+    def conn(self, conn):
+        self._conn = conn
+
+    @mierzony
     def zaloguj_uzytkownika(self, login, haslo):
+        """
+        Loguje pracownika. Weryfikacja bcrypt trwa celowo długo, dlatego
+        interfejs wywołuje tę metodę w wątku roboczym. Skrót zapisany
+        z innym kosztem niż koszt_hasla jest po udanym logowaniu
+        przeliczany i podmieniany w bazie.
+
+        Returns:
+            bool: True, gdy login i hasło są poprawne
+        """
         cursor = self.conn.cursor()
-        cursor.execute("SELECT * FROM Pracownik WHERE login = ?", (login,))
+        cursor.execute(PRACOWNIK_PO_LOGINIE, (login,))
         pracownik = cursor.fetchone()
         if pracownik:
             if self.weryfikuj_haslo(haslo, pracownik[2]):
+                if self.koszt_skrotu(pracownik[2]) != self.koszt_hasla:
+                    self._przelicz_haslo(pracownik[0], haslo)
                 self.zalogowany_pracownik = Recepcjonista(
                     pracownik[0], pracownik[1], pracownik[3], pracownik[4], pracownik[5]
                 )
@@ -30,106 +99,149 @@ class SystemObslugi:
         return False
     
     def szyfruj_haslo(self, haslo):
-        return bcrypt.hashpw(haslo.encode('utf-8'), bcrypt.gensalt())
+        return bcrypt.hashpw(haslo.encode('utf-8'), bcrypt.gensalt(rounds=self.koszt_hasla))
     
     def weryfikuj_haslo(self, haslo, zaszyfrowane_haslo):
+        if isinstance(zaszyfrowane_haslo, str):
+            zaszyfrowane_haslo = zaszyfrowane_haslo.encode('utf-8')
         return bcrypt.checkpw(haslo.encode('utf-8'), zaszyfrowane_haslo)
 
+    def koszt_skrotu(self, zaszyfrowane_haslo):
+        # Skrót bcrypt ma postać $2b$12$..., koszt to druga sekcja
+        if isinstance(zaszyfrowane_haslo, bytes):
+            zaszyfrowane_haslo = zaszyfrowane_haslo.decode('ascii')
+        return int(zaszyfrowane_haslo.split("$")[2])
+
+    def _przelicz_haslo(self, pracownik_id, haslo):
+        # Nowy skrót liczony przed transakcją, aby nie trzymać blokady zapisu
+        zaszyfrowane_haslo = self.szyfruj_haslo(haslo)
+        try:
+            with self.jednostka_pracy() as conn:
+                conn.execute(ZMIEN_HASLO_PRACOWNIKA, (zaszyfrowane_haslo, pracownik_id))
+        except sqlite3.Error:
+            # Stary skrót nadal jest poprawny - spróbujemy przy kolejnym logowaniu
+            logging.getLogger(__name__).exception("Nie udało się przeliczyć hasła pracownika %s", pracownik_id)
+
     def wyloguj_uzytkownika(self):
         self.zalogowany_pracownik = None
         return True
 
+    def zamknij(self):
+        # Poczekaj na zapis paragonów z już zakończonych wizyt
+        self.kolejka_paragonow.zamknij()
+        if self.pula_polaczen is not None:
+            self.pula_polaczen.zamknij()
+            self.pula_polaczen = None
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    @mierzony
     def monitoruj_status(self):
-        cursor = self.conn.cursor()
-        cursor.execute("SELECT COUNT(*) FROM Klient")
-        liczba_klientow = cursor.fetchone()[0]
-        cursor.execute("SELECT COUNT(*) FROM Opaska WHERE czasWyjscia IS NULL")
-        aktywne_opaski = cursor.fetchone()[0]
+        # Status odczytywany z liczników; baza odpytywana tylko przy uzgadnianiu
+        if (self._ostatnie_uzgodnienie is None or
+                time.monotonic() - self._ostatnie_uzgodnienie >= self.OKRES_UZGADNIANIA_LICZNIKOW):
+            self.uzgodnij_liczniki()
         return {
             "status": self.status_systemu,
-            "liczba_klientow": liczba_klientow,
-            "aktywne_opaski": aktywne_opaski,
-            "data": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            "liczba_klientow": self.liczba_klientow,
+            "aktywne_opaski": self.aktywne_opaski,
+            "data": self.zegar().strftime("%Y-%m-%d %H:%M:%S")
         }
 
-    def inicjalizuj_baze_danych(self):
-        first_run = not os.path.exists('baza_danych.db')
-        self.conn = sqlite3.connect('baza_danych.db')
+    def uzgodnij_liczniki(self):
+        cursor = kursor(self.conn)
+        cursor.execute(LICZBA_KLIENTOW)
+        liczba_klientow = cursor.fetchone()[0]
+        cursor.execute(LICZBA_AKTYWNYCH_OPASEK)
+        aktywne_opaski = cursor.fetchone()[0]
+        with self._blokada_licznikow:
+            self.liczba_klientow = liczba_klientow
+            self.aktywne_opaski = aktywne_opaski
+            self._ostatnie_uzgodnienie = time.monotonic()
+
+    def _zmien_liczniki(self, klienci=0, opaski=0):
+        with self._blokada_licznikow:
+            self.liczba_klientow += klienci
+            self.aktywne_opaski += opaski
+
+    @contextmanager
+    def jednostka_pracy(self):
+        """
+        Grupuje zapisy klas domenowych w jedną transakcję bazy danych.
+
+        Klasy domenowe (OpaskaNFC, Transakcja, Recepcjonista) nie zatwierdzają
+        zmian samodzielnie - robi to dopiero wyjście z tego bloku, jednym
+        commitem. Wyjątek wewnątrz bloku wycofuje wszystkie zapisy.
+
+        Yields:
+            sqlite3.Connection: Połączenie, przez które należy wykonywać zapisy
+        """
+        conn = self.conn
+        # BEGIN IMMEDIATE od razu zajmuje blokadę zapisu, więc równoległe
+        # stanowiska czekają (busy_timeout) zamiast kończyć się błędem
+        # "database is locked" przy próbie podniesienia blokady odczytu
+        if not conn.in_transaction:
+            start = time.perf_counter()
+            conn.execute("BEGIN IMMEDIATE")
+            self._watek.oczekiwanie = getattr(self._watek, "oczekiwanie", 0.0) + time.perf_counter() - start
+        try:
+            yield conn
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            self._po_wycofaniu()
+            raise
+
+    def pobierz_oczekiwanie_na_blokade(self):
+        """
+        Zwraca i zeruje łączny czas (w sekundach), przez jaki bieżący wątek
+        czekał na blokadę zapisu od poprzedniego wywołania.
+        """
+        oczekiwanie = getattr(self._watek, "oczekiwanie", 0.0)
+        self._watek.oczekiwanie = 0.0
+        return oczekiwanie
+
+    def _po_platnosci(self, typ, dane):
+        # Nowa transakcja zmienia wyłącznie raporty obejmujące jej dzień
+        self.pamiec_raportow.uniewaznij_dzien(dane["data"][:10])
+
+    def _po_wycofaniu(self):
+        # Struktury w pamięci mogły już odzwierciedlać wycofane zmiany
+        self.pula_opasek.uniewaznij()
+
+    def inicjalizuj_baze_danych(self, sciezka='baza_danych.db'):
+        first_run = not os.path.exists(sciezka)
+        self.pula_polaczen = PulaPolaczen(sciezka, prog_wolnych_zapytan_ms=self.PROG_WOLNEGO_ZAPYTANIA_MS)
+        # Schemat jest idempotentny, więc starsze bazy również dostają nowe indeksy
+        self._utworz_tabele()
         if first_run:
-            self._utworz_tabele()
             self._dodaj_przykladowe_dane()
+        self._uzupelnij_przychody_dzienne()
+        self.pula_opasek.zaladuj(self.conn)
+        self.uzgodnij_liczniki()
 
     def _utworz_tabele(self):
         cursor = self.conn.cursor()
-        cursor.execute("""
-        CREATE TABLE IF NOT EXISTS Klient (
-            identyfikator INTEGER PRIMARY KEY,
-            imie TEXT NOT NULL,
-            nazwisko TEXT NOT NULL,
-            wiek INTEGER NOT NULL
-        );
-        """)
-
-        cursor.execute("""
-        CREATE TABLE IF NOT EXISTS Pracownik (
-            identyfikator INTEGER PRIMARY KEY AUTOINCREMENT,
-            login TEXT NOT NULL UNIQUE,
-            haslo TEXT NOT NULL,
-            imie TEXT NOT NULL,
-            nazwisko TEXT NOT NULL,
-            stanowisko TEXT NOT NULL
-        );
-        """)
-
-        cursor.execute("""
-        CREATE TABLE IF NOT EXISTS Opaska (
-            numerSeryjny INTEGER PRIMARY KEY,
-            czasWejscia TEXT,
-            czasWyjscia TEXT,
-            klient_id INTEGER,
-            FOREIGN KEY (klient_id) REFERENCES Klient(identyfikator)
-        );
-        """)
-
-        cursor.execute("""
-        CREATE TABLE IF NOT EXISTS Transakcja (
-            identyfikatorTransakcji INTEGER PRIMARY KEY AUTOINCREMENT,
-            kwota REAL NOT NULL,
-            data TEXT NOT NULL,
-            metodaPlatnosci TEXT NOT NULL,
-            klient_id INTEGER,
-            pracownik_id INTEGER,
-            FOREIGN KEY (klient_id) REFERENCES Klient(identyfikator),
-            FOREIGN KEY (pracownik_id) REFERENCES Pracownik(identyfikator)
-        );
-        """)
-
-        cursor.execute("""
-        CREATE TABLE IF NOT EXISTS Raport (
-            identyfikatorRaportu INTEGER PRIMARY KEY AUTOINCREMENT,
-            data TEXT NOT NULL,
-            typRaportu TEXT NOT NULL,
-            pracownik_id INTEGER,
-            FOREIGN KEY (pracownik_id) REFERENCES Pracownik(identyfikator)
-        );
-        """)
+        for instrukcja in SCHEMAT:
+            cursor.execute(instrukcja)
         self.conn.commit()
 
     def _dodaj_przykladowe_dane(self):
         cursor = self.conn.cursor()
 
-        cursor.execute("INSERT INTO Pracownik (identyfikator, login, haslo, imie, nazwisko, stanowisko) VALUES (?, ?, ?, ?, ?, ?)", (1, "admin", self.szyfruj_haslo("admin"), "Piotr", "Zielinski", "Kierownik"))
+        cursor.execute(DODAJ_PRACOWNIKA_Z_IDENTYFIKATOREM, (1, "admin", self.szyfruj_haslo("admin"), "Piotr", "Zielinski", "Kierownik"))
 
         pesele = [self.generuj_testowy_pesel() for _ in range(5)]
         for i in range(1, 6):
-            cursor.execute("INSERT INTO Klient (identyfikator, imie, nazwisko, wiek) VALUES (?, ?, ?, ?)", (pesele[i - 1], f"Klient{i}", f"Testowy{i}", random.randint(18, 65)))
+            cursor.execute(DODAJ_KLIENTA, (pesele[i - 1], f"Klient{i}", f"Testowy{i}", random.randint(18, 65)))
 
         for i in range(1, 6):
-            cursor.execute("INSERT INTO Opaska (numerSeryjny, czasWejscia, czasWyjscia, klient_id) VALUES (?, ?, ?, ?)", (1000 + i, datetime.now().strftime("%Y-%m-%d %H:%M:%S"), None, pesele[i - 1]))
+            cursor.execute(DODAJ_OPASKE, (1000 + i, datetime.now().strftime("%Y-%m-%d %H:%M:%S"), None, pesele[i - 1]))
 
         # Wolne opaski
         for i in range(6, 11):
-            cursor.execute("INSERT INTO Opaska (numerSeryjny, czasWejscia, czasWyjscia, klient_id) VALUES (?, ?, ?, ?)", (1000 + i, (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d %H:%M:%S"), (datetime.now() - timedelta(hours=23)).strftime("%Y-%m-%d %H:%M:%S"), None))
+            cursor.execute(DODAJ_OPASKE, (1000 + i, (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d %H:%M:%S"), (datetime.now() - timedelta(hours=23)).strftime("%Y-%m-%d %H:%M:%S"), None))
 
         # Przykładowe transakcje
         for i in range(30):
@@ -138,22 +250,29 @@ class SystemObslugi:
             kwota = round(random.uniform(10.0, 100.0), 2)
             data = (datetime.now() - timedelta(days=random.randint(0, 30))).strftime("%Y-%m-%d %H:%M:%S")
             metoda_platnosci = random.choice(["Gotówka", "Karta"])
-            cursor.execute(
-                "INSERT INTO Transakcja (kwota, data, metodaPlatnosci, klient_id, pracownik_id) VALUES (?, ?, ?, ?, ?)",
-                (kwota, data, metoda_platnosci, klient_id, pracownik_id)
-            )
+            cursor.execute(DODAJ_TRANSAKCJE, (kwota, data, metoda_platnosci, klient_id, pracownik_id))
 
         # Przykładowe raporty
         for i in range(5):
             data = (datetime.now() - timedelta(days=random.randint(0, 30))).strftime("%Y-%m-%d")
             typ_raportu = random.choice(["finansowy", "statystyki"])
-            cursor.execute(
-                "INSERT INTO Raport (data, typRaportu, pracownik_id) VALUES (?, ?, ?)",
-                (data, typ_raportu, 1)
-            )
+            cursor.execute(DODAJ_RAPORT, (data, typ_raportu, 1))
 
         self.conn.commit()
 
+    def _uzupelnij_przychody_dzienne(self):
+        # Jednorazowe wypełnienie agregatu dla baz sprzed jego wprowadzenia
+        cursor = self.conn.cursor()
+        cursor.execute(PRZYCHODY_DZIENNE_DO_UZUPELNIENIA)
+        if cursor.fetchone()[0]:
+            self._odbuduj_przychody_dzienne()
+
+    def _odbuduj_przychody_dzienne(self):
+        cursor = self.conn.cursor()
+        cursor.execute(USUN_PRZYCHODY_DZIENNE)
+        cursor.execute(ODBUDUJ_PRZYCHODY_DZIENNE)
+        self.conn.commit()
+
     def oblicz_koszt_pobytu(self, czas_wejscia, czas_wyjscia):
         """
         Oblicza koszt pobytu na basenie na podstawie czasu wejścia i wyjścia.
@@ -165,52 +284,49 @@ class SystemObslugi:
         Returns:
             float: Całkowity koszt pobytu
         """
-        koszt = 0
-        current_time = czas_wejscia
-        
-        while current_time < czas_wyjscia:
-            is_weekend = current_time.weekday() >= 5
-            hour = current_time.hour
-            
-            # Określenie stawki godzinowej
-            if is_weekend:
-                rate = 16  # Stawka weekendowa
-            elif 8 <= hour < 16:
-                rate = 10  # Stawka dzienna (8:00-16:00)
-            else:
-                rate = 14  # Stawka wieczorowa
+        koszt = self.cennik.oblicz_koszt(czas_wejscia, czas_wyjscia)
+        return round(koszt, 2)  # Zaokrąglenie kosztu
 
-            # Oblicz proporcjonalny czas w tej godzinie
-            next_hour = (current_time + timedelta(hours=1)).replace(minute=0, second=0, microsecond=0)
-            end_of_interval = min(next_hour, czas_wyjscia)
-            duration = (end_of_interval - current_time).total_seconds() / 3600  # W godzinach
+    def oblicz_koszty_pobytow(self, czasy_wejscia, czasy_wyjscia):
+        """
+        Oblicza koszty wielu pobytów jednocześnie (np. przy rozliczaniu
+        wszystkich otwartych opasek na zamknięcie dnia).
 
-            # Zaokrąglenie czasu do pełnych godzin
-            if duration % 1 > 0:
-                duration = int(duration) + 1
-            
-            koszt += rate * duration
-            current_time = end_of_interval
+        Args:
+            czasy_wejscia: Sekwencja lub tablica czasów wejścia
+            czasy_wyjscia: Sekwencja lub tablica czasów wyjścia
 
-        return round(koszt, 2)  # Zaokrąglenie kosztu
+        Returns:
+            numpy.ndarray: Koszty poszczególnych pobytów
+        """
+        return self.cennik.oblicz_koszty(czasy_wejscia, czasy_wyjscia).round(2)
     
+    @mierzony
     def obsluz_wejscie(self, imie, nazwisko, wiek, id_klienta):
         try:
             # Tworzenie nowego klienta
             klient = Klient(id_klienta, imie, nazwisko, wiek)
 
-            # Wydawanie opaski przez recepcjonistę
-            opaska = self.zalogowany_pracownik.wydaj_opaske_nfc(klient, self.conn)
+            with self.jednostka_pracy() as conn:
+                # Wydawanie opaski przez recepcjonistę
+                opaska = self.zalogowany_pracownik.wydaj_opaske_nfc(klient, conn, self.pula_opasek, self.zegar())
+
+                if opaska:
+                    # Zapisywanie klienta do bazy
+                    cursor = kursor(conn)
+                    cursor.execute(KLIENT_ISTNIEJE, (klient.identyfikator,))
+                    nowy_klient = cursor.fetchone() is None
+                    cursor.execute(
+                        ZAPISZ_KLIENTA,
+                        (klient.identyfikator, klient.imie, klient.nazwisko, klient.wiek)
+                    )
 
             if opaska:
-                # Zapisywanie klienta do bazy
-                cursor = self.conn.cursor()
-                cursor.execute(
-                    "INSERT OR REPLACE INTO Klient (identyfikator, imie, nazwisko, wiek) VALUES (?, ?, ?, ?)",
-                    (klient.identyfikator, klient.imie, klient.nazwisko, klient.wiek)
+                self._zmien_liczniki(klienci=int(nowy_klient), opaski=1)
+                self.zdarzenia.publikuj(
+                    ZDARZENIE_KLIENT_ZAREJESTROWANY,
+                    klient_id=klient.identyfikator, numer_opaski=opaska.numerSeryjny
                 )
-                self.conn.commit()
-
                 return f"Pomyślnie zarejestrowano klienta i wydano opaskę nr {opaska.numerSeryjny}"
             else:
                 return "Brak dostępnych opasek!"
@@ -220,40 +336,50 @@ class SystemObslugi:
         except sqlite3.Error as e:
             return f"Błąd bazy danych: {e}"
         
+    @mierzony
     def obsluz_wyjscie(self, numer_seryjny, metoda_platnosci):
         try:
-            cursor = self.conn.cursor()
-            cursor.execute("""
-                SELECT o.numerSeryjny, o.czasWejscia, o.klient_id, k.imie, k.nazwisko
-                FROM Opaska o
-                JOIN Klient k ON o.klient_id = k.identyfikator
-                WHERE o.numerSeryjny = ? AND o.czasWyjscia IS NULL
-            """, (numer_seryjny,))
-
-            dane_opaski = cursor.fetchone()
-            if not dane_opaski:
-                return "Nie znaleziono aktywnej opaski o podanym numerze."
-            
-            opaska = OpaskaNFC(dane_opaski[0])
-            opaska.czasWejscia = datetime.strptime(dane_opaski[1], "%Y-%m-%d %H:%M:%S")
-            opaska.klient_id = dane_opaski[2]
-
-            czas_wyjscia = datetime.now()
-            czas_pobytu = (czas_wyjscia - opaska.czasWejscia).total_seconds() / 3600
-            godziny = int(czas_pobytu) + (1 if czas_pobytu % 1 > 0 else 0)
-
-            koszt = self.oblicz_koszt_pobytu(opaska.czasWejscia, czas_wyjscia)
-
-            transakcja = Transakcja(
-                koszt,
-                czas_wyjscia.strftime("%Y-%m-%d %H:%M:%S"),
-                metoda_platnosci,
-                opaska.klient_id,
-                self.zalogowany_pracownik.identyfikator
-            )
+            # Odczyt opaski, płatność i zwolnienie opaski w jednej transakcji,
+            # więc dwa stanowiska nie rozliczą tej samej opaski dwukrotnie
+            with self.jednostka_pracy() as conn:
+                cursor = kursor(conn)
+                cursor.execute(AKTYWNA_OPASKA, (numer_seryjny,))
+
+                dane_opaski = cursor.fetchone()
+                if not dane_opaski:
+                    return "Nie znaleziono aktywnej opaski o podanym numerze."
+                
+                opaska = OpaskaNFC(dane_opaski[0])
+                opaska.czasWejscia = datetime.strptime(dane_opaski[1], "%Y-%m-%d %H:%M:%S")
+                opaska.klient_id = dane_opaski[2]
+
+                czas_wyjscia = self.zegar()
+                czas_pobytu = (czas_wyjscia - opaska.czasWejscia).total_seconds() / 3600
+                godziny = int(czas_pobytu) + (1 if czas_pobytu % 1 > 0 else 0)
+
+                koszt = self.oblicz_koszt_pobytu(opaska.czasWejscia, czas_wyjscia)
+
+                transakcja = Transakcja(
+                    koszt,
+                    czas_wyjscia.strftime("%Y-%m-%d %H:%M:%S"),
+                    metoda_platnosci,
+                    opaska.klient_id,
+                    self.zalogowany_pracownik.identyfikator
+                )
 
-            if self.zalogowany_pracownik.przyjmij_platnosc(transakcja, self.conn):
-                opaska.deaktywuj(self.conn)
+                przyjeto_platnosc = self.zalogowany_pracownik.przyjmij_platnosc(transakcja, conn)
+                if przyjeto_platnosc:
+                    opaska.deaktywuj(conn, self.pula_opasek, czas_wyjscia)
+
+            if przyjeto_platnosc:
+                self._zmien_liczniki(opaski=-1)
+                self.zdarzenia.publikuj(
+                    ZDARZENIE_PLATNOSC_ZAREJESTROWANA,
+                    identyfikator_transakcji=transakcja.identyfikatorTransakcji,
+                    kwota=transakcja.kwota, data=transakcja.data,
+                    metoda_platnosci=transakcja.metodaPlatnosci
+                )
+                self.zdarzenia.publikuj(ZDARZENIE_OPASKA_ZWOLNIONA, numer_opaski=opaska.numerSeryjny)
 
                 summary = f"\nPodsumowanie wizyty dla klienta {dane_opaski[3]} {dane_opaski[4]}:"
                 summary += f"\nCzas wejścia: {opaska.czasWejscia}"
@@ -261,7 +387,8 @@ class SystemObslugi:
                 summary += f"\nCzas pobytu: {godziny} godz."
                 summary += f"\nNależność: {koszt} zł"
 
-                transakcja.wydrukuj_paragon()
+                # Paragon zapisywany i drukowany w tle, poza ścieżką obsługi klienta
+                self.kolejka_paragonow.dodaj(transakcja)
 
                 return summary
             else:
@@ -272,7 +399,146 @@ class SystemObslugi:
         except Exception as e:
             return f"Wystąpił błąd: {e}"
         
-    def obsluz_raport(self, typ_raportu, data_od, data_do):
+    def importuj_klientow(self, sciezka, separator=None, postep=None):
+        """
+        Importuje klientów z pliku CSV z nagłówkiem pesel,imie,nazwisko,wiek.
+        Plik czytany jest strumieniowo, a poprawne wiersze zapisywane są
+        paczkami przez executemany - każda paczka w osobnej transakcji,
+        więc import nie blokuje długo stanowisk. Istniejący klienci
+        (ten sam PESEL) są aktualizowani.
+
+        Args:
+            sciezka (str): Ścieżka pliku CSV
+            separator (str): Separator kolumn; domyślnie wykrywany z nagłówka
+            postep (callable): Wywoływane po każdej paczce jako postep(przetworzone_wiersze)
+
+        Returns:
+            dict: Liczba zaimportowanych i odrzuconych wierszy oraz lista
+                (numer wiersza, powód) dla pierwszych odrzuceń
+
+        Raises:
+            ValueError: Gdy w pliku brakuje wymaganych kolumn
+        """
+        podsumowanie = {"zaimportowano": 0, "odrzucono": 0, "odrzucone": []}
+        paczka = []
+
+        def zapisz_paczke():
+            with self.jednostka_pracy() as conn:
+                conn.executemany(IMPORTUJ_KLIENTA, paczka)
+            podsumowanie["zaimportowano"] += len(paczka)
+            paczka.clear()
+
+        with open(sciezka, newline="", encoding="utf-8-sig") as plik:
+            if separator is None:
+                # Arkusze w polskiej wersji Excela zapisują CSV ze średnikami
+                naglowek = plik.readline()
+                plik.seek(0)
+                try:
+                    separator = csv.Sniffer().sniff(naglowek, delimiters=",;\t").delimiter
+                except csv.Error:
+                    separator = ","
+            reader = csv.DictReader(plik, delimiter=separator)
+            brakujace = {"pesel", "imie", "nazwisko", "wiek"} - set(reader.fieldnames or [])
+            if brakujace:
+                raise ValueError(f"Brak kolumn w pliku: {', '.join(sorted(brakujace))}")
+
+            numer_wiersza = 1
+            for numer_wiersza, wiersz in enumerate(reader, start=2):
+                try:
+                    pesel = waliduj_pesel(wiersz["pesel"] or "")
+                    imie = (wiersz["imie"] or "").strip()
+                    nazwisko = (wiersz["nazwisko"] or "").strip()
+                    if not imie or not nazwisko:
+                        raise ValueError("Brak imienia lub nazwiska")
+                    wiek = int(wiersz["wiek"])
+                    if wiek < 0:
+                        raise ValueError("Wiek nie może być ujemny")
+                except (ValueError, TypeError) as e:
+                    podsumowanie["odrzucono"] += 1
+                    if len(podsumowanie["odrzucone"]) < self.MAKS_OPISANYCH_ODRZUCEN:
+                        podsumowanie["odrzucone"].append((numer_wiersza, str(e)))
+                    continue
+
+                paczka.append((pesel, imie, nazwisko, wiek))
+                if len(paczka) >= self.ROZMIAR_PACZKI_IMPORTU:
+                    zapisz_paczke()
+                    if postep is not None:
+                        postep(numer_wiersza - 1)
+
+            if paczka:
+                zapisz_paczke()
+            if postep is not None:
+                postep(numer_wiersza - 1)
+
+        self.uzgodnij_liczniki()
+        return podsumowanie
+
+    def dodaj_opaski(self, numer_od, numer_do):
+        """
+        Rejestruje nowe opaski o numerach seryjnych z zakresu [numer_od, numer_do]
+        jedną transakcją. Numery już zarejestrowane są pomijane. Pula wolnych
+        opasek jest odświeżana w tej samej transakcji, więc nowe opaski
+        można wydawać od razu.
+
+        Returns:
+            dict: Liczba dodanych i pominiętych numerów
+        """
+        if numer_od <= 0 or numer_do < numer_od:
+            raise ValueError("Nieprawidłowy zakres numerów seryjnych")
+
+        with self.jednostka_pracy() as conn:
+            cursor = conn.cursor()
+            cursor.executemany(
+                DODAJ_WOLNA_OPASKE,
+                ((numer,) for numer in range(numer_od, numer_do + 1))
+            )
+            dodane = cursor.rowcount
+            # Odczyt pod blokadą zapisu - żadne stanowisko nie wydaje teraz opaski
+            self.pula_opasek.zaladuj(conn)
+
+        return {"dodano": dodane, "pominieto": numer_do - numer_od + 1 - dodane}
+
+    def wycofaj_opaski(self, numer_od, numer_do):
+        """
+        Wycofuje z użycia opaski o numerach z zakresu [numer_od, numer_do].
+        Opaski noszone w tej chwili przez klientów nie są wycofywane.
+
+        Returns:
+            dict: Liczba wycofanych opasek i pominiętych, bo będących w użyciu
+        """
+        if numer_od <= 0 or numer_do < numer_od:
+            raise ValueError("Nieprawidłowy zakres numerów seryjnych")
+
+        with self.jednostka_pracy() as conn:
+            cursor = conn.cursor()
+            cursor.execute(LICZBA_OPASEK_W_UZYCIU_Z_ZAKRESU, (numer_od, numer_do))
+            w_uzyciu = cursor.fetchone()[0]
+            cursor.execute(USUN_WOLNE_OPASKI_Z_ZAKRESU, (numer_od, numer_do))
+            wycofane = cursor.rowcount
+            self.pula_opasek.zaladuj(conn)
+
+        return {"wycofano": wycofane, "w_uzyciu": w_uzyciu}
+
+    @mierzony
+    def obsluz_raport(self, typ_raportu, data_od, data_do, rozmiar_paczki=None, postep=None, anulowanie=None,
+                      format_pliku="csv"):
+        """
+        Generuje raport i zapisuje go do pliku w wybranym formacie. Przeznaczone do wywołania
+        w wątku roboczym - postęp zgłaszany jest przez postep(wiersze, bajty),
+        a ustawienie zdarzenia anulowanie przerywa eksport.
+
+        Args:
+            typ_raportu (str): "finansowy" lub "statystyki"
+            data_od (str): Pierwszy dzień raportu
+            data_do (str): Ostatni dzień raportu
+            rozmiar_paczki (int): Liczba wierszy na jedno fetchmany
+            postep (callable): Opcjonalne wywołanie zwrotne postępu
+            anulowanie (threading.Event): Opcjonalna flaga przerwania
+            format_pliku (str): "csv", "csv.gz", "jsonl" lub "jsonl.gz"
+
+        Returns:
+            str: Komunikat dla użytkownika
+        """
         try:
             # Pobieranie parametrów raportu
             typ_raportu = typ_raportu.lower()
@@ -281,27 +547,45 @@ class SystemObslugi:
 
             # Tworzenie i generowanie raportu
             raport = Raport(
-                datetime.now().strftime("%Y-%m-%d"),
+                self.zegar().strftime("%Y-%m-%d"),
                 typ_raportu
             )
-
-            dane_raportu = self.zalogowany_pracownik.generuj_raport(typ_raportu, data_od, data_do, self.conn)
-
-            if dane_raportu:
-                # Eksport do pliku
-                nazwa_pliku = f"raport_{typ_raportu}_{data_od}_do_{data_do}.csv"
-                raport.eksportuj_dane(dane_raportu, nazwa_pliku)
-
+            nazwa_pliku = raport.nazwa_pliku(data_od, data_do, format_pliku)
+
+            conn = self.conn
+            with raport.przerywalne_zapytania(conn, anulowanie):
+                wiersze = self.pamiec_raportow.pobierz(typ_raportu, data_od, data_do)
+                if wiersze is None:
+                    # Wiersze strumieniowane z kursora prosto do pliku
+                    wiersze = self.pamiec_raportow.przechwyc(
+                        typ_raportu, data_od, data_do,
+                        self.zalogowany_pracownik.strumieniuj_raport(
+                            typ_raportu, data_od, data_do, conn, rozmiar_paczki, anulowanie, self.zegar()
+                        )
+                    )
+                wiersze = iter(wiersze)
+                pierwszy_wiersz = next(wiersze, None)
+
+                if pierwszy_wiersz is not None:
+                    # Eksport do pliku
+                    raport.eksportuj_dane(
+                        itertools.chain([pierwszy_wiersz], wiersze), nazwa_pliku,
+                        postep=postep, anulowanie=anulowanie, format_pliku=format_pliku
+                    )
+
+            if pierwszy_wiersz is not None:
                 # Loguj generowanie raportu
-                cursor = self.conn.cursor()
-                cursor.execute("INSERT INTO Raport (data, typRaportu, pracownik_id) VALUES (?, ?, ?)", (datetime.now().strftime("%Y-%m-%d"), typ_raportu, self.zalogowany_pracownik.identyfikator))
-                self.conn.commit()
+                with self.jednostka_pracy() as conn:
+                    cursor = conn.cursor()
+                    cursor.execute(DODAJ_RAPORT, (raport.data, typ_raportu, self.zalogowany_pracownik.identyfikator))
 
                 return f"Raport wygenerowany i zapisany w pliku {nazwa_pliku}"
 
             else:
                 return "Brak danych do wygenerowania raportu."
 
+        except RaportAnulowany:
+            return "Generowanie raportu zostało anulowane."
         except ValueError as e:
             return f"Błąd podczas wprowadzania danych: {e}"
         except sqlite3.Error as e:
@@ -309,6 +593,51 @@ class SystemObslugi:
         except Exception as e:
             return f"Wystąpił błąd: {e}"
         
+    def generuj_dane_testowe(self, klienci, opaski, transakcje, dni, ziarno=None):
+        """
+        Wypełnia bazę syntetycznymi danymi do testów wydajności i odświeża
+        struktury pochodne: agregat przychodów, pamięć raportów, pulę opasek
+        i liczniki statusu.
+
+        Args:
+            klienci (int): Liczba klientów
+            opaski (int): Liczba wolnych opasek
+            transakcje (int): Liczba transakcji
+            dni (int): Liczba dni historii transakcji, kończącej się dzisiaj
+            ziarno (int): Ziarno generatora liczb losowych dla powtarzalności
+
+        Returns:
+            dict: Liczba wygenerowanych wierszy
+
+        Raises:
+            ValueError: Dla ujemnej liczby wierszy lub historii krótszej niż dzień
+        """
+        # Sprawdzenie przed usunięciem indeksów transakcji
+        if min(klienci, opaski, transakcje) < 0:
+            raise ValueError("Liczba generowanych wierszy nie może być ujemna")
+        if dni < 1:
+            raise ValueError("Historia transakcji musi obejmować co najmniej jeden dzień")
+
+        conn = self.conn
+        cursor = conn.cursor()
+        synchronous = cursor.execute("PRAGMA synchronous").fetchone()[0]
+        # Indeksy budowane raz po załadowaniu są dużo szybsze niż
+        # aktualizowane przy każdym z milionów wstawianych wierszy
+        for instrukcja in USUN_INDEKSY_TRANSAKCJI:
+            cursor.execute(instrukcja)
+        cursor.execute("PRAGMA synchronous=OFF")
+        try:
+            wynik = GeneratorDanych(conn, ziarno).generuj(klienci, opaski, transakcje, dni)
+        finally:
+            cursor.execute(f"PRAGMA synchronous={int(synchronous)}")
+            self._utworz_tabele()
+
+        self._odbuduj_przychody_dzienne()
+        self.pamiec_raportow.wyczysc()
+        self.pula_opasek.zaladuj(conn)
+        self.uzgodnij_liczniki()
+        return wynik
+
     def generuj_testowy_pesel(self):
         start_date = datetime(1800, 1, 1)
         end_date = datetime(2299, 12, 31)
@@ -343,6 +672,7 @@ class SystemObslugi:
         pesel = pesel_without_checksum + str(checksum)
         return int(pesel)
 
+    @mierzony
     def pobierz_statystyki(self):
         return {
             "dzienne_przychody": self._wygeneruj_dzienne_przychody(),
@@ -350,22 +680,17 @@ class SystemObslugi:
         }
     
     def _wygeneruj_dzienne_przychody(self):
-        today = datetime.now().strftime("%Y-%m-%d")
-        cursor = self.conn.cursor()
-        cursor.execute("""
-            SELECT COALESCE(SUM(kwota), 0) FROM Transakcja 
-            WHERE data LIKE ?
-        """, (f"{today}%",))
+        today = self.zegar().strftime("%Y-%m-%d")
+        cursor = kursor(self.conn)
+        cursor.execute(PRZYCHOD_W_DNIU, (today,))
         revenue = cursor.fetchone()[0]
         return round(revenue if revenue else 0, 2)
     
     def _wygeneruj_miesieczne_przychody(self):
-        current_month = datetime.now().strftime("%Y-%m")
-        cursor = self.conn.cursor()
-        cursor.execute("""
-            SELECT COALESCE(SUM(kwota), 0) FROM Transakcja 
-            WHERE data LIKE ?
-        """, (f"{current_month}%",))
+        poczatek_miesiaca = self.zegar().replace(day=1)
+        poczatek_nastepnego = (poczatek_miesiaca + timedelta(days=31)).replace(day=1)
+        cursor = kursor(self.conn)
+        cursor.execute(PRZYCHOD_W_OKRESIE, (poczatek_miesiaca.strftime("%Y-%m-%d"), poczatek_nastepnego.strftime("%Y-%m-%d")))
         revenue = cursor.fetchone()[0]
         return round(revenue if revenue else 0, 2)
 
@@ -373,14 +698,14 @@ class SystemObslugi:
         try:
             cursor = self.conn.cursor()
             # Sprawdź czy login jest unikalny
-            cursor.execute("SELECT COUNT(*) FROM Pracownik WHERE login = ?", (login,))
+            cursor.execute(LICZBA_PRACOWNIKOW_O_LOGINIE, (login,))
             if cursor.fetchone()[0] > 0:
                 return False, "Pracownik o podanym loginie już istnieje."
                 
             # Szyfrowanie hasła i dodanie pracownika
             zaszyfrowane_haslo = self.szyfruj_haslo(haslo)
             cursor.execute(
-                "INSERT INTO Pracownik (login, haslo, imie, nazwisko, stanowisko) VALUES (?, ?, ?, ?, ?)",
+                DODAJ_PRACOWNIKA,
                 (login, zaszyfrowane_haslo, imie, nazwisko, stanowisko)
             )
             self.conn.commit()
@@ -395,12 +720,12 @@ class SystemObslugi:
                 return False, "Nie można usunąć własnego konta."
                 
             cursor = self.conn.cursor()
-            cursor.execute("SELECT imie, nazwisko FROM Pracownik WHERE identyfikator = ?", (pracownik_id,))
+            cursor.execute(IMIE_I_NAZWISKO_PRACOWNIKA, (pracownik_id,))
             pracownik = cursor.fetchone()
             if not pracownik:
                 return False, "Nie znaleziono pracownika o podanym ID."
                 
-            cursor.execute("DELETE FROM Pracownik WHERE identyfikator = ?", (pracownik_id,))
+            cursor.execute(USUN_PRACOWNIKA, (pracownik_id,))
             self.conn.commit()
             return True, f"Pracownik {pracownik[0]} {pracownik[1]} został pomyślnie usunięty."
         except sqlite3.Error as e:
@@ -409,7 +734,7 @@ class SystemObslugi:
     def pobierz_pracownikow(self):
         try:
             cursor = self.conn.cursor()
-            cursor.execute("SELECT identyfikator, login, imie, nazwisko, stanowisko FROM Pracownik")
+            cursor.execute(LISTA_PRACOWNIKOW)
             return cursor.fetchall()
         except sqlite3.Error:
             return []
@@ -0,0 +1,178 @@
+import argparse
+import json
+import os
+import platform
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from SystemObslugi import SystemObslugi
+from classes.Recepcjonista import Recepcjonista
+
+# Liczba transakcji w kolejnych bazach testowych
+ROZMIARY = [10000, 100000, 1000000]
+# Dopuszczalny wzrost mediany względem wyników bazowych. Szum między
+# przebiegami sięga kilkudziesięciu procent, a pełny skan tabeli zamiast
+# indeksu to wzrost wielokrotny
+TOLERANCJA = 0.5
+# Różnice poniżej tego progu (ms) to szum pomiaru, nie regresja
+PROG_MS = 0.05
+
+
+def zmierz(funkcja, powtorzenia, przygotuj=None):
+    """
+    Mierzy czas wykonania funkcji. Przygotowanie (np. czyszczenie pamięci
+    podręcznej) nie wlicza się do pomiaru.
+
+    Returns:
+        dict: Mediana, 95. percentyl i minimum w milisekundach
+    """
+    czasy = []
+    for i in range(powtorzenia):
+        if przygotuj is not None:
+            przygotuj()
+        start = time.perf_counter_ns()
+        funkcja(i)
+        czasy.append((time.perf_counter_ns() - start) / 1e6)
+    czasy.sort()
+    return {
+        "mediana_ms": round(statistics.median(czasy), 4),
+        "p95_ms": round(czasy[min(len(czasy) - 1, int(len(czasy) * 0.95))], 4),
+        "min_ms": round(czasy[0], 4),
+        "powtorzenia": powtorzenia,
+    }
+
+
+def benchmark_bazy(katalog, transakcje, powtorzenia):
+    system = SystemObslugi()
+    system.inicjalizuj_baze_danych(os.path.join(katalog, f"baza_{transakcje}.db"))
+    # Opaski dla wszystkich mierzonych wejść; numery za przykładowymi danymi
+    wygenerowane = system.generuj_dane_testowe(
+        klienci=max(1000, transakcje // 10), opaski=powtorzenia + 100,
+        transakcje=transakcje, dni=365, ziarno=transakcje
+    )
+    if wygenerowane["opaski"] != powtorzenia + 100:
+        raise RuntimeError(f"Wygenerowano za mało opasek: {wygenerowane}")
+    system.zalogowany_pracownik = Recepcjonista(1, "admin", "Piotr", "Zielinski", "Kierownik")
+
+    wyniki = {}
+    rng = np.random.default_rng(0)
+    wejscia = [datetime(2025, 1, 6) + timedelta(minutes=int(m)) for m in rng.integers(0, 7 * 24 * 60, 10000)]
+    pobyty = [timedelta(minutes=int(m)) for m in rng.integers(1, 6 * 60, 10000)]
+    wyniki["oblicz_koszt_pobytu"] = zmierz(
+        lambda i: system.oblicz_koszt_pobytu(wejscia[i], wejscia[i] + pobyty[i]), 10000
+    )
+
+    pesele = (90000000000 + np.arange(powtorzenia)).tolist()
+    wydane = []
+
+    # Operacja zakończona błędem (np. brak wolnej opaski) bywa szybsza od
+    # poprawnej - taki pomiar nie może trafić do wyników. Jawny wyjątek
+    # zamiast assert, który python -O pomija
+    def wejscie(i):
+        wynik = system.obsluz_wejscie("Jan", "Testowy", 30, pesele[i])
+        if not wynik.startswith("Pomyślnie"):
+            raise RuntimeError(wynik)
+        wydane.append(wynik.rsplit(" ", 1)[-1])
+    wyniki["obsluz_wejscie"] = zmierz(wejscie, powtorzenia)
+
+    def wyjscie(i):
+        wynik = system.obsluz_wyjscie(wydane[i], "Karta")
+        if "Należność" not in wynik:
+            raise RuntimeError(wynik)
+    wyniki["obsluz_wyjscie"] = zmierz(wyjscie, powtorzenia)
+
+    dzisiaj = datetime.now()
+    rok_temu = (dzisiaj - timedelta(days=365)).strftime("%Y-%m-%d")
+    miesiac_temu = (dzisiaj - timedelta(days=30)).strftime("%Y-%m-%d")
+    dzisiaj = dzisiaj.strftime("%Y-%m-%d")
+
+    def raport(typ, data_od):
+        wynik = system.obsluz_raport(typ, data_od, dzisiaj)
+        if not wynik.startswith("Raport wygenerowany"):
+            raise RuntimeError(wynik)
+    wyniki["obsluz_raport_finansowy_rok"] = zmierz(
+        lambda i: raport("finansowy", rok_temu),
+        max(3, powtorzenia // 20), przygotuj=system.pamiec_raportow.wyczysc
+    )
+    wyniki["obsluz_raport_statystyki_miesiac"] = zmierz(
+        lambda i: raport("statystyki", miesiac_temu),
+        max(3, powtorzenia // 20), przygotuj=system.pamiec_raportow.wyczysc
+    )
+    wyniki["pobierz_statystyki"] = zmierz(lambda i: system.pobierz_statystyki(), powtorzenia)
+
+    system.zamknij()
+    return wyniki
+
+
+def porownaj(wyniki, bazowe, tolerancja):
+    """
+    Zwraca listę regresji: operacji, których mediana wzrosła ponad
+    tolerancję (i ponad próg szumu) względem wyników bazowych.
+    """
+    regresje = []
+    for rozmiar, operacje in wyniki["wyniki"].items():
+        for operacja, pomiar in operacje.items():
+            bazowy = bazowe.get("wyniki", {}).get(rozmiar, {}).get(operacja)
+            if bazowy is None:
+                continue
+            teraz, wczesniej = pomiar["mediana_ms"], bazowy["mediana_ms"]
+            if teraz > wczesniej * (1 + tolerancja) and teraz - wczesniej > PROG_MS:
+                regresje.append((rozmiar, operacja, wczesniej, teraz))
+    return regresje
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mikrobenchmarki PoolPro na generowanych bazach danych.")
+    parser.add_argument("--rozmiary", type=int, nargs="+", default=ROZMIARY, help="Liczby transakcji w bazach testowych")
+    parser.add_argument("--powtorzenia", type=int, default=200, help="Liczba powtórzeń operacji recepcji")
+    parser.add_argument("--wynik", default="benchmarki.json", help="Plik JSON z wynikami")
+    parser.add_argument("--porownaj", help="Plik JSON z wynikami bazowymi do porównania")
+    parser.add_argument("--tolerancja", type=float, default=TOLERANCJA, help="Dopuszczalny względny wzrost mediany")
+    args = parser.parse_args()
+
+    wyniki = {
+        "srodowisko": {
+            "data": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "system": platform.platform(),
+        },
+        "wyniki": {},
+    }
+
+    katalog_roboczy = os.getcwd()
+    wynik_sciezka = os.path.abspath(args.wynik)
+    with tempfile.TemporaryDirectory() as katalog:
+        # Raporty i paragony zapisywane są w katalogu bieżącym
+        os.chdir(katalog)
+        try:
+            for rozmiar in args.rozmiary:
+                wyniki["wyniki"][str(rozmiar)] = benchmark_bazy(katalog, rozmiar, args.powtorzenia)
+                for operacja, pomiar in wyniki["wyniki"][str(rozmiar)].items():
+                    print(f"{rozmiar:>10} {operacja:<36} {pomiar['mediana_ms']:>10.3f} ms  (p95 {pomiar['p95_ms']:.3f} ms)")
+        finally:
+            os.chdir(katalog_roboczy)
+
+    with open(wynik_sciezka, "w", encoding="utf-8") as plik:
+        json.dump(wyniki, plik, indent=2, ensure_ascii=False)
+    print(f"Wyniki zapisano w {wynik_sciezka}")
+
+    if args.porownaj:
+        with open(args.porownaj, encoding="utf-8") as plik:
+            bazowe = json.load(plik)
+        regresje = porownaj(wyniki, bazowe, args.tolerancja)
+        for rozmiar, operacja, wczesniej, teraz in regresje:
+            print(f"REGRESJA {operacja} ({rozmiar} transakcji): {wczesniej:.3f} ms -> {teraz:.3f} ms")
+        if regresje:
+            sys.exit(1)
+        print("Brak regresji względem wyników bazowych")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+from datetime import timedelta
+import numpy as np
+
+GODZINA = timedelta(hours=1)
+GODZIN_W_TYGODNIU = 7 * 24
+MIKROSEKUND_W_GODZINIE = 3600 * 10**6
+# 1970-01-01 był czwartkiem, więc godzina 0 epoki to slot 3 * 24
+PRZESUNIECIE_EPOKI = 3 * 24
+
+class Cennik:
+    STAWKA_WEEKENDOWA = 16
+    STAWKA_DZIENNA = 10
+    STAWKA_WIECZOROWA = 14
+
+    def __init__(self):
+        # Stawka dla każdej godziny tygodnia (0 = poniedziałek 0:00)
+        self.stawki = [
+            self.stawka(dzien, godzina)
+            for dzien in range(7)
+            for godzina in range(24)
+        ]
+        self.suma_tygodnia = sum(self.stawki)
+
+        # Sumy prefiksowe po dwóch tygodniach, żeby reszta pobytu
+        # zaczynająca się pod koniec tygodnia nie wymagała zawijania
+        self.sumy_prefiksowe = [0]
+        for rate in self.stawki + self.stawki:
+            self.sumy_prefiksowe.append(self.sumy_prefiksowe[-1] + rate)
+        self._sumy_prefiksowe_np = np.array(self.sumy_prefiksowe, dtype=np.int64)
+
+    def stawka(self, dzien_tygodnia, godzina):
+        if dzien_tygodnia >= 5:
+            return self.STAWKA_WEEKENDOWA
+        elif 8 <= godzina < 16:
+            return self.STAWKA_DZIENNA
+        return self.STAWKA_WIECZOROWA
+
+    def oblicz_koszt(self, czas_wejscia, czas_wyjscia):
+        """
+        Oblicza koszt pobytu w czasie stałym, niezależnie od jego długości.
+
+        Każda rozpoczęta godzina zegarowa jest liczona w całości według
+        stawki obowiązującej w tej godzinie. Pobyt dzielony jest na pełne
+        tygodnie i resztę, której koszt odczytywany jest z sum prefiksowych.
+
+        Args:
+            czas_wejscia (datetime): Data i czas wejścia
+            czas_wyjscia (datetime): Data i czas wyjścia
+
+        Returns:
+            int: Całkowity koszt pobytu
+        """
+        if czas_wyjscia <= czas_wejscia:
+            return 0
+
+        poczatek = czas_wejscia.replace(minute=0, second=0, microsecond=0)
+        koniec = czas_wyjscia.replace(minute=0, second=0, microsecond=0)
+        if koniec < czas_wyjscia:
+            koniec += GODZINA
+
+        liczba_godzin = (koniec - poczatek) // GODZINA
+        tygodnie, reszta = divmod(liczba_godzin, GODZIN_W_TYGODNIU)
+        slot = poczatek.weekday() * 24 + poczatek.hour
+
+        return (
+            tygodnie * self.suma_tygodnia
+            + self.sumy_prefiksowe[slot + reszta]
+            - self.sumy_prefiksowe[slot]
+        )
+
+    def oblicz_koszty(self, czasy_wejscia, czasy_wyjscia):
+        """
+        Oblicza koszty wielu pobytów naraz, z tym samym zaokrąglaniem
+        godzin i stawkami co oblicz_koszt.
+
+        Args:
+            czasy_wejscia: Sekwencja lub tablica czasów wejścia
+                (datetime, datetime64 albo tekst "RRRR-MM-DD GG:MM:SS")
+            czasy_wyjscia: Sekwencja lub tablica czasów wyjścia tej samej długości
+
+        Returns:
+            numpy.ndarray: Koszty poszczególnych pobytów (float64)
+        """
+        wejscia = np.asarray(czasy_wejscia, dtype="datetime64[us]").view(np.int64)
+        wyjscia = np.asarray(czasy_wyjscia, dtype="datetime64[us]").view(np.int64)
+
+        # Godziny od epoki: początek zaokrąglony w dół, koniec w górę
+        poczatek = wejscia // MIKROSEKUND_W_GODZINIE
+        koniec = -(-wyjscia // MIKROSEKUND_W_GODZINIE)
+
+        liczba_godzin = np.where(wyjscia > wejscia, koniec - poczatek, 0)
+        tygodnie, reszta = np.divmod(liczba_godzin, GODZIN_W_TYGODNIU)
+        slot = (poczatek + PRZESUNIECIE_EPOKI) % GODZIN_W_TYGODNIU
+
+        koszty = (
+            tygodnie * self.suma_tygodnia
+            + self._sumy_prefiksowe_np[slot + reszta]
+            - self._sumy_prefiksowe_np[slot]
+        )
+        return koszty.astype(np.float64)
@@ -0,0 +1,138 @@
+import logging
+from logging.handlers import RotatingFileHandler
+import sqlite3
+import time
+
+from classes.Zapytania import ZAPYTANIA_Z_DANYMI_WRAZLIWYMI, Polaczenie
+
+dziennik_wolnych_zapytan = logging.getLogger("poolpro.wolne_zapytania")
+# Bez włączonego dziennika komunikaty nie trafiają do stderr przez handler ostatniej szansy
+dziennik_wolnych_zapytan.addHandler(logging.NullHandler())
+dziennik_wolnych_zapytan.propagate = False
+# Parametry mogą być długie (np. paczki executemany) - w dzienniku tylko ich początek
+MAKS_DLUGOSC_PARAMETROW = 200
+
+
+def wlacz_dziennik_wolnych_zapytan(sciezka="wolne_zapytania.log", maks_bajtow=5 * 1024 * 1024, kopie=5):
+    """
+    Kieruje dziennik wolnych zapytań do rotowanego pliku. Ponowne wywołanie
+    z tą samą ścieżką niczego nie zmienia.
+
+    Args:
+        sciezka (str): Ścieżka pliku dziennika
+        maks_bajtow (int): Rozmiar pliku, po którym następuje rotacja
+        kopie (int): Liczba zachowywanych starszych plików
+    """
+    sciezka_bezwzgledna = RotatingFileHandler(sciezka, delay=True).baseFilename
+    for handler in dziennik_wolnych_zapytan.handlers:
+        if getattr(handler, "baseFilename", None) == sciezka_bezwzgledna:
+            return
+    handler = RotatingFileHandler(sciezka, maxBytes=maks_bajtow, backupCount=kopie, encoding="utf-8", delay=True)
+    handler.setFormatter(logging.Formatter("%(asctime)s %(threadName)s %(message)s"))
+    dziennik_wolnych_zapytan.addHandler(handler)
+    dziennik_wolnych_zapytan.setLevel(logging.WARNING)
+    dziennik_wolnych_zapytan.propagate = False
+
+
+def dziennik_wlaczony():
+    """
+    Sprawdza, czy dziennik wolnych zapytań ma dokąd pisać. Bez tego
+    kursory śledzone nie mierzą czasu ani nie wykonują EXPLAIN.
+    """
+    if not dziennik_wolnych_zapytan.isEnabledFor(logging.WARNING):
+        return False
+    return any(not isinstance(handler, logging.NullHandler) for handler in dziennik_wolnych_zapytan.handlers)
+
+
+def opis_parametrow(sql, parametry):
+    """
+    Zwraca parametry zapytania do zapisania w dzienniku. Parametry zapytań
+    z ZAPYTANIA_Z_DANYMI_WRAZLIWYMI są pomijane w całości, a wartości
+    binarne (np. skróty haseł) zawsze maskowane.
+    """
+    if sql in ZAPYTANIA_Z_DANYMI_WRAZLIWYMI:
+        return "<ukryte>"
+    if isinstance(parametry, (tuple, list)):
+        parametry = type(parametry)("<bajty>" if isinstance(p, bytes) else p for p in parametry)
+    opis = repr(parametry)
+    if len(opis) > MAKS_DLUGOSC_PARAMETROW:
+        opis = opis[:MAKS_DLUGOSC_PARAMETROW] + "..."
+    return opis
+
+
+class KursorSledzony(sqlite3.Cursor):
+    """
+    Kursor mierzący czas execute/executemany. Dla SELECT mierzony jest czas
+    do pierwszego wiersza - przy agregacjach i sortowaniu to cała praca,
+    przy strumieniowaniu wyników pobieranie kolejnych paczek nie jest liczone.
+    """
+
+    def execute(self, sql, parametry=()):
+        if not dziennik_wlaczony():
+            return super().execute(sql, parametry)
+        start = time.perf_counter()
+        try:
+            return super().execute(sql, parametry)
+        finally:
+            self.connection._sprawdz_czas(sql, parametry, time.perf_counter() - start)
+
+    def executemany(self, sql, parametry):
+        if not dziennik_wlaczony():
+            return super().executemany(sql, parametry)
+        # Parametry bywają generatorem - zapamiętujemy pierwszy zestaw do EXPLAIN
+        pierwszy = []
+
+        def zapamietaj(wiersze):
+            for wiersz in wiersze:
+                if not pierwszy:
+                    pierwszy.append(wiersz)
+                yield wiersz
+
+        start = time.perf_counter()
+        try:
+            return super().executemany(sql, zapamietaj(parametry))
+        finally:
+            self.connection._sprawdz_czas(sql, pierwszy[0] if pierwszy else None, time.perf_counter() - start, wiele=True)
+
+
+class PolaczenieSledzone(Polaczenie):
+    """
+    Połączenie, którego zapytania przekraczające prog_ms trafiają do
+    dziennika wolnych zapytań razem z parametrami i planem EXPLAIN QUERY PLAN.
+    """
+    prog_ms = 100
+
+    def cursor(self, factory=KursorSledzony):
+        return super().cursor(factory)
+
+    # Connection.execute wykonuje zapytanie z pominięciem Cursor.execute,
+    # dlatego skróty połączenia przechodzą jawnie przez kursor śledzony
+    def execute(self, sql, parametry=()):
+        return self.cursor().execute(sql, parametry)
+
+    def executemany(self, sql, parametry):
+        return self.cursor().executemany(sql, parametry)
+
+    def _sprawdz_czas(self, sql, parametry, czas, wiele=False):
+        czas_ms = czas * 1000
+        if czas_ms < self.prog_ms:
+            return
+        zapytanie = " ".join(sql.split())
+        dziennik_wolnych_zapytan.warning(
+            "%.1f ms%s: %s | parametry: %s | plan: %s",
+            czas_ms, " (executemany)" if wiele else "", zapytanie, opis_parametrow(sql, parametry),
+            self.plan_zapytania(sql, parametry)
+        )
+
+    def plan_zapytania(self, sql, parametry=()):
+        """
+        Zwraca plan EXPLAIN QUERY PLAN zapytania w jednej linii, np.
+        "SCAN Transakcja; USE TEMP B-TREE FOR GROUP BY".
+        """
+        try:
+            # Zwykły kursor - plan nie jest ponownie mierzony
+            kursor = sqlite3.Cursor(self)
+            wiersze = kursor.execute(f"EXPLAIN QUERY PLAN {sql}", parametry if parametry is not None else ()).fetchall()
+        except (sqlite3.Error, ValueError) as e:
+            return f"niedostępny ({e})"
+        return "; ".join(wiersz[-1] for wiersz in wiersze) or "brak"
@@ -0,0 +1,185 @@
+from datetime import date, timedelta
+import numpy as np
+
+from classes.Cennik import Cennik
+from classes.Klient import WAGI_PESEL
+from classes.Zapytania import DODAJ_TRANSAKCJE, DODAJ_WOLNA_OPASKE, NASTEPNY_NUMER_OPASKI, ZAPISZ_KLIENTA
+
+IMIONA = np.array([
+    "Anna", "Maria", "Katarzyna", "Małgorzata", "Agnieszka", "Barbara", "Ewa", "Zofia",
+    "Jan", "Piotr", "Krzysztof", "Andrzej", "Tomasz", "Paweł", "Michał", "Jakub",
+])
+NAZWISKA = np.array([
+    "Nowak", "Kowalski", "Wiśniewski", "Wójcik", "Kowalczyk", "Kamiński", "Lewandowski", "Zieliński",
+    "Szymański", "Woźniak", "Dąbrowski", "Kozłowski", "Jankowski", "Mazur", "Kwiatkowski", "Krawczyk",
+])
+METODY_PLATNOSCI = np.array(["Gotówka", "Karta"])
+
+# Względna liczba wejść w kolejnych godzinach doby (pływalnia czynna 6-22)
+ROZKLAD_GODZIN_ROBOCZY = np.array([
+    0, 0, 0, 0, 0, 0, 6, 9, 5, 3, 3, 3, 4, 4, 5, 7, 10, 12, 12, 10, 7, 4, 0, 0
+], dtype=np.float64)
+ROZKLAD_GODZIN_WEEKEND = np.array([
+    0, 0, 0, 0, 0, 0, 2, 4, 7, 10, 12, 12, 11, 11, 12, 12, 10, 8, 6, 5, 3, 2, 0, 0
+], dtype=np.float64)
+GODZINA_ZAMKNIECIA = 23
+# Względny ruch w dniach tygodnia, od poniedziałku
+ROZKLAD_DNI_TYGODNIA = np.array([0.9, 0.85, 0.9, 0.95, 1.0, 1.8, 1.6])
+
+
+class GeneratorDanych:
+    # Liczba wierszy generowanych i zapisywanych jednym executemany
+    ROZMIAR_PACZKI = 100000
+
+    def __init__(self, conn, ziarno=None):
+        self.conn = conn
+        self.rng = np.random.default_rng(ziarno)
+        self.cennik = Cennik()
+
+    def generuj(self, klienci, opaski, transakcje, dni, koniec=None, pracownik_id=1):
+        """
+        Wypełnia bazę klientami, wolnymi opaskami i historią transakcji.
+        Wszystkie wiersze zapisywane są w jednej transakcji, paczkami.
+
+        Args:
+            klienci (int): Liczba klientów
+            opaski (int): Liczba opasek (numery za istniejącymi opaskami)
+            transakcje (int): Liczba transakcji
+            dni (int): Liczba dni historii kończącej się w dniu koniec
+            koniec (date): Ostatni dzień historii, domyślnie dzisiaj
+            pracownik_id (int): Pracownik przypisany do transakcji
+
+        Returns:
+            dict: Liczba wygenerowanych wierszy w poszczególnych tabelach
+        """
+        with self.conn:
+            pesele = self.generuj_klientow(klienci)
+            dodane_opaski = self.generuj_opaski(opaski)
+            self.generuj_transakcje(transakcje, dni, pesele, koniec, pracownik_id)
+        return {"klienci": len(pesele), "opaski": dodane_opaski, "transakcje": transakcje}
+
+    def generuj_pesele(self, liczba, rok_od=1940, rok_do=2019):
+        """
+        Losuje unikalne, poprawne numery PESEL (z cyfrą kontrolną) dla osób
+        urodzonych w latach rok_od-rok_do. Obliczenia są wektorowe.
+
+        Returns:
+            tuple: (numpy.ndarray numerów PESEL jako int64, numpy.ndarray roczników)
+        """
+        pesele = np.empty(0, dtype=np.int64)
+        roczniki = np.empty(0, dtype=np.int64)
+        while len(pesele) < liczba:
+            brakuje = liczba - len(pesele)
+            poczatek = np.datetime64(f"{rok_od}-01-01")
+            zakres = (np.datetime64(f"{rok_do + 1}-01-01") - poczatek).astype(np.int64)
+            urodziny = poczatek + self.rng.integers(0, zakres, brakuje)
+
+            rok = urodziny.astype("datetime64[Y]").astype(np.int64) + 1970
+            miesiac = urodziny.astype("datetime64[M]").astype(np.int64) % 12 + 1
+            dzien = (urodziny - urodziny.astype("datetime64[M]")).astype(np.int64) + 1
+            miesiac = miesiac + np.select(
+                [rok < 1900, rok >= 2200, rok >= 2100, rok >= 2000], [80, 60, 40, 20], 0
+            )
+            numer = (
+                (rok % 100) * 10**8 + miesiac * 10**6 + dzien * 10**4
+                + self.rng.integers(0, 10000, brakuje)
+            )
+
+            # Cyfry od najbardziej znaczącej i cyfra kontrolna
+            cyfry = numer[:, None] // 10 ** np.arange(9, -1, -1) % 10
+            kontrolna = (10 - cyfry @ np.array(WAGI_PESEL) % 10) % 10
+
+            pesele = np.concatenate([pesele, numer * 10 + kontrolna])
+            roczniki = np.concatenate([roczniki, rok])
+            pesele, indeksy = np.unique(pesele, return_index=True)
+            roczniki = roczniki[indeksy]
+        return pesele, roczniki
+
+    def generuj_klientow(self, liczba):
+        pesele, roczniki = self.generuj_pesele(liczba)
+        wiek = date.today().year - roczniki
+        for start in range(0, liczba, self.ROZMIAR_PACZKI):
+            koniec = min(start + self.ROZMIAR_PACZKI, liczba)
+            n = koniec - start
+            self.conn.executemany(
+                ZAPISZ_KLIENTA,
+                zip(
+                    pesele[start:koniec].tolist(),
+                    IMIONA[self.rng.integers(0, len(IMIONA), n)].tolist(),
+                    NAZWISKA[self.rng.integers(0, len(NAZWISKA), n)].tolist(),
+                    wiek[start:koniec].tolist(),
+                )
+            )
+        return pesele
+
+    def generuj_opaski(self, liczba, numer_od=None):
+        """
+        Dodaje wolne opaski o kolejnych numerach, domyślnie za najwyższym
+        numerem w bazie. Numery już istniejące są pomijane.
+
+        Returns:
+            int: Liczba faktycznie dodanych opasek
+        """
+        if numer_od is None:
+            numer_od = self.conn.execute(NASTEPNY_NUMER_OPASKI).fetchone()[0]
+        cursor = self.conn.executemany(
+            DODAJ_WOLNA_OPASKE,
+            ((numer,) for numer in range(numer_od, numer_od + liczba))
+        )
+        return cursor.rowcount
+
+    def generuj_transakcje(self, liczba, dni, pesele, koniec=None, pracownik_id=1):
+        """
+        Generuje transakcje rozłożone na dni i godziny według typowego ruchu
+        na pływalni. Kwota wynika z cennika i losowej długości pobytu, a
+        transakcje zapisywane są w kolejności czasu wyjścia, jak przy
+        normalnej pracy recepcji.
+        """
+        if liczba == 0 or len(pesele) == 0:
+            return
+        koniec = koniec or date.today()
+        pierwszy_dzien = np.datetime64(koniec - timedelta(days=dni - 1))
+        dzien_tygodnia = (np.arange(dni) + pierwszy_dzien.astype(np.int64) + 3) % 7
+        wagi = ROZKLAD_DNI_TYGODNIA[dzien_tygodnia]
+        liczby_w_dniu = self.rng.multinomial(liczba, wagi / wagi.sum())
+
+        godziny_robocze = ROZKLAD_GODZIN_ROBOCZY / ROZKLAD_GODZIN_ROBOCZY.sum()
+        godziny_weekend = ROZKLAD_GODZIN_WEEKEND / ROZKLAD_GODZIN_WEEKEND.sum()
+
+        # Paczki złożone z całych dni, aby po posortowaniu zachować porządek w czasie
+        granice = np.searchsorted(
+            np.cumsum(liczby_w_dniu), np.arange(self.ROZMIAR_PACZKI, liczba, self.ROZMIAR_PACZKI)
+        )
+        for dni_paczki in np.split(np.arange(dni), np.unique(granice + 1)):
+            dzien = np.repeat(dni_paczki, liczby_w_dniu[dni_paczki])
+            n = len(dzien)
+            if n == 0:
+                continue
+
+            weekend = dzien_tygodnia[dzien] >= 5
+            godzina = np.where(
+                weekend,
+                self.rng.choice(24, n, p=godziny_weekend),
+                self.rng.choice(24, n, p=godziny_robocze),
+            )
+            sekunda_dnia = godzina * 3600 + self.rng.integers(0, 3600, n)
+            wejscia = pierwszy_dzien.astype("datetime64[s]") + dzien * 86400 + sekunda_dnia
+            # Typowy pobyt 1-2 h, z długim ogonem, zakończony przed zamknięciem
+            pobyt = np.clip(self.rng.gamma(2.0, 2700.0, n), 900, 6 * 3600).astype(np.int64)
+            pobyt = np.maximum(np.minimum(pobyt, GODZINA_ZAMKNIECIA * 3600 - sekunda_dnia), 900)
+            kolejnosc = np.argsort(wejscia + pobyt)
+            wejscia = wejscia[kolejnosc]
+            wyjscia = wejscia + pobyt[kolejnosc]
+
+            kwoty = self.cennik.oblicz_koszty(wejscia, wyjscia).round(2)
+            daty = np.char.replace(np.datetime_as_string(wyjscia, unit="s"), "T", " ")
+            self.conn.executemany(
+                DODAJ_TRANSAKCJE,
+                zip(
+                    kwoty.tolist(),
+                    daty.tolist(),
+                    METODY_PLATNOSCI[(self.rng.random(n) < 0.65).astype(np.int64)].tolist(),
+                    pesele[self.rng.integers(0, len(pesele), n)].tolist(),
+                    [pracownik_id] * n,
+                )
+            )
@@ -1,3 +1,41 @@
+from datetime import date
+
+# Wagi cyfr PESEL przy liczeniu cyfry kontrolnej
+WAGI_PESEL = (1, 3, 7, 9, 1, 3, 7, 9, 1, 3)
+
+# Przesunięcie numeru miesiąca -> stulecie urodzenia
+STULECIA_PESEL = {80: 1800, 0: 1900, 20: 2000, 40: 2100, 60: 2200}
+
+def waliduj_pesel(pesel):
+    """
+    Sprawdza format, datę urodzenia i cyfrę kontrolną numeru PESEL.
+
+    Args:
+        pesel (str | int): Numer PESEL; liczba jest uzupełniana zerami z przodu
+
+    Returns:
+        int: PESEL jako liczba, używany jako identyfikator klienta
+
+    Raises:
+        ValueError: Gdy numer jest niepoprawny
+    """
+    pesel = f"{pesel:011d}" if isinstance(pesel, int) else str(pesel).strip()
+    if len(pesel) != 11 or not pesel.isdigit():
+        raise ValueError("PESEL musi składać się z 11 cyfr")
+
+    cyfry = [int(znak) for znak in pesel]
+    kontrolna = (10 - sum(w * c for w, c in zip(WAGI_PESEL, cyfry)) % 10) % 10
+    if kontrolna != cyfry[10]:
+        raise ValueError("Niepoprawna cyfra kontrolna PESEL")
+
+    miesiac = cyfry[2] * 10 + cyfry[3]
+    przesuniecie = miesiac - (miesiac - 1) % 20 - 1
+    try:
+        date(STULECIA_PESEL[przesuniecie] + cyfry[0] * 10 + cyfry[1], miesiac - przesuniecie, cyfry[4] * 10 + cyfry[5])
+    except (KeyError, ValueError):
+        raise ValueError("Niepoprawna data urodzenia w numerze PESEL")
+    return int(pesel)
+
 class Klient:
     def __init__(self, identyfikator, imie, nazwisko, wiek):
         self.identyfikator = identyfikator
@@ -0,0 +1,125 @@
+import logging
+import os
+import queue
+import threading
+
+
+class KolejkaParagonow:
+    # Liczba paragonów zapisywanych w jednym przebiegu wątku drukarki
+    ROZMIAR_PACZKI = 64
+    # Paragonów w archiwum dzielonych na podkatalogi po tyle numerów transakcji
+    PARAGONOW_W_KATALOGU = 10000
+
+    def __init__(self, katalog="paragony", maks_do_wydruku=1000):
+        """
+        Kolejka paragonów obsługiwana przez wątek w tle. Wyjście klienta
+        tylko dodaje transakcję do kolejki; wątek zapisuje paragony paczkami
+        do archiwum (jeden plik na transakcję) i przekazuje je drukarce.
+
+        Args:
+            katalog (str): Katalog archiwum paragonów
+            maks_do_wydruku (int): Pojemność kolejki drukarki; gdy nikt jej nie
+                opróżnia, najstarsze paragony są z niej usuwane (pozostają w archiwum)
+        """
+        self.katalog = katalog
+        self._kolejka = queue.Queue()
+        self._do_wydruku = queue.Queue(maxsize=maks_do_wydruku)
+        self._katalogi = set()
+        self._watek = None
+        self._blokada = threading.Lock()
+
+    def dodaj(self, transakcja):
+        # Wątek uruchamiany przy pierwszym paragonie, nie przy tworzeniu systemu
+        with self._blokada:
+            if self._watek is None:
+                self._watek = threading.Thread(target=self._pracuj, name="paragony", daemon=True)
+                self._watek.start()
+        self._kolejka.put(transakcja)
+
+    def sciezka_paragonu(self, identyfikator_transakcji):
+        return os.path.join(
+            self.katalog,
+            f"{identyfikator_transakcji // self.PARAGONOW_W_KATALOGU:06d}",
+            f"paragon_{identyfikator_transakcji}.txt"
+        )
+
+    def pobierz_do_wydruku(self, limit_czasu=None):
+        """
+        Zwraca kolejny zarchiwizowany paragon do wydrukowania, czekając
+        najwyżej limit_czasu sekund (None - bez limitu).
+
+        Returns:
+            tuple: (identyfikator transakcji, treść paragonu) lub None po upływie limitu
+        """
+        try:
+            return self._do_wydruku.get(timeout=limit_czasu)
+        except queue.Empty:
+            return None
+
+    def oczekuj(self):
+        # Czeka, aż wszystkie dodane paragony zostaną zarchiwizowane
+        self._kolejka.join()
+
+    def zamknij(self):
+        with self._blokada:
+            watek, self._watek = self._watek, None
+        if watek is not None:
+            self._kolejka.put(None)
+            watek.join()
+
+    def _pracuj(self):
+        while True:
+            paczka = [self._kolejka.get()]
+            while len(paczka) < self.ROZMIAR_PACZKI:
+                try:
+                    paczka.append(self._kolejka.get_nowait())
+                except queue.Empty:
+                    break
+
+            koniec = False
+            for transakcja in paczka:
+                if transakcja is None:
+                    koniec = True
+                    continue
+                # Błąd jednego paragonu nie może zatrzymać wątku - oczekuj()
+                # czekałby wtedy w nieskończoność, a kolejne paragony przepadały
+                try:
+                    self._archiwizuj(transakcja)
+                except Exception:
+                    logging.getLogger(__name__).exception(
+                        "Nie udało się zapisać paragonu transakcji %s",
+                        getattr(transakcja, "identyfikatorTransakcji", None)
+                    )
+            for _ in paczka:
+                self._kolejka.task_done()
+            if koniec:
+                return
+
+    def _archiwizuj(self, transakcja):
+        tresc = transakcja.tresc_paragonu()
+        sciezka = self.sciezka_paragonu(transakcja.identyfikatorTransakcji)
+        katalog = os.path.dirname(sciezka)
+        if katalog not in self._katalogi:
+            os.makedirs(katalog, exist_ok=True)
+            self._katalogi.add(katalog)
+
+        # Zapis do pliku tymczasowego i podmiana - w archiwum nie ma niepełnych paragonów
+        tymczasowy = f"{sciezka}.tmp"
+        with open(tymczasowy, "w", encoding="utf-8") as plik:
+            plik.write(tresc)
+            # Treść na dysku przed podmianą - paragon przetrwa awarię systemu
+            plik.flush()
+            os.fsync(plik.fileno())
+        os.replace(tymczasowy, sciezka)
+
+        # Drukarka nie nadąża lub nie jest podłączona - czeka na nią tylko
+        # maks_do_wydruku najnowszych paragonów, starsze są wyłącznie w archiwum
+        while True:
+            try:
+                self._do_wydruku.put_nowait((transakcja.identyfikatorTransakcji, tresc))
+                return
+            except queue.Full:
+                try:
+                    self._do_wydruku.get_nowait()
+                except queue.Empty:
+                    pass
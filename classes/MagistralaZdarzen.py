@@ -0,0 +1,38 @@
+import logging
+import threading
+
+ZDARZENIE_KLIENT_ZAREJESTROWANY = "klient_zarejestrowany"
+ZDARZENIE_PLATNOSC_ZAREJESTROWANA = "platnosc_zarejestrowana"
+ZDARZENIE_OPASKA_ZWOLNIONA = "opaska_zwolniona"
+
+class MagistralaZdarzen:
+    def __init__(self):
+        self._subskrybenci = {}
+        self._blokada = threading.Lock()
+
+    def subskrybuj(self, typ, obsluga):
+        with self._blokada:
+            self._subskrybenci.setdefault(typ, []).append(obsluga)
+
+    def odsubskrybuj(self, typ, obsluga):
+        with self._blokada:
+            if obsluga in self._subskrybenci.get(typ, []):
+                self._subskrybenci[typ].remove(obsluga)
+
+    def publikuj(self, typ, **dane):
+        """
+        Powiadamia subskrybentów o zdarzeniu domenowym. Obsługa wywoływana
+        jest w wątku publikującym, już po zatwierdzeniu transakcji, więc
+        błąd subskrybenta nie wpływa na wynik operacji.
+
+        Args:
+            typ (str): Typ zdarzenia, np. ZDARZENIE_PLATNOSC_ZAREJESTROWANA
+            **dane: Szczegóły zdarzenia przekazywane subskrybentom
+        """
+        with self._blokada:
+            obslugi = list(self._subskrybenci.get(typ, []))
+        for obsluga in obslugi:
+            try:
+                obsluga(typ, dane)
+            except Exception:
+                logging.getLogger(__name__).exception("Błąd obsługi zdarzenia %s", typ)
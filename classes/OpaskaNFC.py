@@ -1,5 +1,7 @@
 from datetime import datetime
 
+from classes.Zapytania import AKTYWUJ_OPASKE, DEAKTYWUJ_OPASKE, kursor
+
 class OpaskaNFC:
     def __init__(self, numer_seryjny):
         self.numerSeryjny = numer_seryjny
@@ -7,28 +9,34 @@ class OpaskaNFC:
         self.czasWyjscia = None
         self.klient_id = None
 
-    def aktywuj(self, klient, conn):
+    def aktywuj(self, klient, conn, pula=None, czas=None):
+        """
+        Przypisuje opaskę klientowi, o ile w bazie jest nadal wolna.
+
+        Returns:
+            bool: False, gdy opaska jest już zajęta lub została wycofana
+        """
         self.klient_id = klient.identyfikator
-        self.czasWejscia = datetime.now()
+        self.czasWejscia = czas or datetime.now()
         
         # Sync with database
-        cursor = conn.cursor()
-        cursor.execute("""
-            UPDATE Opaska 
-            SET czasWejscia = ?, czasWyjscia = NULL, klient_id = ? 
-            WHERE numerSeryjny = ?
-        """, (datetime.now().strftime("%Y-%m-%d %H:%M:%S"), self.klient_id, self.numerSeryjny))
-        conn.commit()
-
-    def deaktywuj(self, conn):
+        cursor = kursor(conn)
+        cursor.execute(AKTYWUJ_OPASKE, (self.czasWejscia.strftime("%Y-%m-%d %H:%M:%S"), self.klient_id, self.numerSeryjny))
+        if cursor.rowcount != 1:
+            self.klient_id = None
+            return False
+
+        if pula is not None:
+            pula.zajmij(self.numerSeryjny)
+        return True
+
+    def deaktywuj(self, conn, pula=None, czas=None):
         self.klient_id = None
-        self.czasWyjscia = datetime.now()
+        self.czasWyjscia = czas or datetime.now()
 
         # Sync with database
-        cursor = conn.cursor()
-        cursor.execute("""
-            UPDATE Opaska 
-            SET czasWyjscia = ?, klient_id = NULL
-            WHERE numerSeryjny = ?
-        """, (self.czasWyjscia.strftime("%Y-%m-%d %H:%M:%S"), self.numerSeryjny))
-        conn.commit()
\ No newline at end of file
+        cursor = kursor(conn)
+        cursor.execute(DEAKTYWUJ_OPASKE, (self.czasWyjscia.strftime("%Y-%m-%d %H:%M:%S"), self.numerSeryjny))
+
+        if pula is not None:
+            pula.zwroc(self.numerSeryjny)
@@ -0,0 +1,83 @@
+from collections import OrderedDict
+from datetime import datetime
+import threading
+
+from classes.Raport import zakres_dni
+
+class PamiecRaportow:
+    def __init__(self, pojemnosc=32, maks_wierszy=10000, zegar=datetime.now):
+        self.pojemnosc = pojemnosc
+        # Większe raporty są tylko strumieniowane, bez zapamiętywania
+        self.maks_wierszy = maks_wierszy
+        self.zegar = zegar
+        self._wpisy = OrderedDict()
+        self._wersja = 0
+        self._blokada = threading.Lock()
+
+    def _klucz(self, typ_raportu, data_od, data_do):
+        return (typ_raportu, *zakres_dni(data_od, data_do))
+
+    def _zamkniety(self, klucz):
+        # Płatności z dnia bieżącego mogą przyjmować inne stanowiska (inne
+        # procesy), których nie widzimy - zapamiętywane są tylko okresy
+        # kończące się przed dzisiejszym dniem
+        return klucz[2] <= self.zegar().strftime("%Y-%m-%d")
+
+    def pobierz(self, typ_raportu, data_od, data_do):
+        klucz = self._klucz(typ_raportu, data_od, data_do)
+        if not self._zamkniety(klucz):
+            return None
+        with self._blokada:
+            wiersze = self._wpisy.get(klucz)
+            if wiersze is not None:
+                self._wpisy.move_to_end(klucz)
+            return wiersze
+
+    def przechwyc(self, typ_raportu, data_od, data_do, wiersze):
+        """
+        Przepuszcza strumień wierszy raportu, jednocześnie go zapamiętując.
+        Wynik trafia do pamięci dopiero po przeczytaniu całego strumienia
+        i tylko wtedy, gdy w międzyczasie nic go nie unieważniło.
+
+        Yields:
+            tuple: Kolejne wiersze raportu
+        """
+        klucz = self._klucz(typ_raportu, data_od, data_do)
+        if not self._zamkniety(klucz):
+            yield from wiersze
+            return
+        with self._blokada:
+            wersja = self._wersja
+
+        zebrane = []
+        for wiersz in wiersze:
+            if zebrane is not None:
+                zebrane.append(wiersz)
+                if len(zebrane) > self.maks_wierszy:
+                    zebrane = None
+            yield wiersz
+
+        if zebrane is None:
+            return
+        with self._blokada:
+            if wersja != self._wersja:
+                return
+            self._wpisy[klucz] = zebrane
+            self._wpisy.move_to_end(klucz)
+            while len(self._wpisy) > self.pojemnosc:
+                self._wpisy.popitem(last=False)
+
+    def uniewaznij_dzien(self, dzien):
+        # Usuwa tylko raporty, których zakres obejmuje dany dzień
+        with self._blokada:
+            self._wersja += 1
+            for klucz in [k for k in self._wpisy if k[1] <= dzien < k[2]]:
+                del self._wpisy[klucz]
+
+    def wyczysc(self):
+        with self._blokada:
+            self._wersja += 1
+            self._wpisy.clear()
+
+    def __len__(self):
+        return len(self._wpisy)
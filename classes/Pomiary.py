@@ -0,0 +1,117 @@
+from bisect import bisect_left
+from datetime import datetime
+import functools
+import json
+import os
+import threading
+import time
+
+# Górne granice przedziałów histogramu w milisekundach; ostatni przedział jest otwarty
+GRANICE_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class Histogram:
+    def __init__(self):
+        self.liczba = 0
+        self.suma_ms = 0.0
+        self.maks_ms = 0.0
+        self.kubelki = [0] * (len(GRANICE_MS) + 1)
+
+    def dodaj(self, czas_ms):
+        self.liczba += 1
+        self.suma_ms += czas_ms
+        if czas_ms > self.maks_ms:
+            self.maks_ms = czas_ms
+        self.kubelki[bisect_left(GRANICE_MS, czas_ms)] += 1
+
+    def percentyl(self, q):
+        """
+        Szacuje percentyl jako górną granicę przedziału, w którym wypada
+        (nie więcej niż najdłuższy zmierzony czas).
+        """
+        if self.liczba == 0:
+            return 0.0
+        prog = q * self.liczba
+        narastajaco = 0
+        for indeks, liczba in enumerate(self.kubelki):
+            narastajaco += liczba
+            if narastajaco >= prog:
+                break
+        if indeks == len(GRANICE_MS):
+            return self.maks_ms
+        return min(GRANICE_MS[indeks], self.maks_ms)
+
+
+class Pomiary:
+    def __init__(self):
+        self._histogramy = {}
+        self._blokada = threading.Lock()
+        self.od = datetime.now()
+
+    def zapisz(self, operacja, czas_ms):
+        with self._blokada:
+            histogram = self._histogramy.get(operacja)
+            if histogram is None:
+                histogram = self._histogramy[operacja] = Histogram()
+            histogram.dodaj(czas_ms)
+
+    def podsumowanie(self):
+        """
+        Zwraca dla każdej operacji liczbę wywołań oraz średni, 50., 95.
+        i 99. percentyl i maksymalny czas trwania w milisekundach.
+        """
+        with self._blokada:
+            return {
+                operacja: {
+                    "liczba": histogram.liczba,
+                    "srednia_ms": round(histogram.suma_ms / histogram.liczba, 3),
+                    "p50_ms": round(histogram.percentyl(0.50), 3),
+                    "p95_ms": round(histogram.percentyl(0.95), 3),
+                    "p99_ms": round(histogram.percentyl(0.99), 3),
+                    "maks_ms": round(histogram.maks_ms, 3),
+                }
+                for operacja, histogram in self._histogramy.items()
+            }
+
+    def zrzuc(self, sciezka):
+        """
+        Zapisuje podsumowanie i pełne histogramy do pliku JSON, np. do
+        dołączenia do zgłoszenia o wolnym działaniu stanowiska.
+        """
+        with self._blokada:
+            histogramy = {
+                operacja: list(histogram.kubelki) for operacja, histogram in self._histogramy.items()
+            }
+        dane = {
+            "od": self.od.strftime("%Y-%m-%d %H:%M:%S"),
+            "do": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "granice_ms": list(GRANICE_MS),
+            "operacje": self.podsumowanie(),
+            "histogramy": histogramy,
+        }
+        tymczasowy = f"{sciezka}.tmp"
+        with open(tymczasowy, "w", encoding="utf-8") as plik:
+            json.dump(dane, plik, indent=2, ensure_ascii=False)
+        os.replace(tymczasowy, sciezka)
+
+    def wyczysc(self):
+        with self._blokada:
+            self._histogramy.clear()
+            self.od = datetime.now()
+
+
+def mierzony(funkcja):
+    """
+    Dekorator metod SystemObslugi: zapisuje czas wywołania w self.pomiary
+    pod nazwą metody, również gdy metoda zakończy się wyjątkiem.
+    """
+    nazwa = funkcja.__name__
+
+    @functools.wraps(funkcja)
+    def opakowanie(self, *args, **kwargs):
+        start = time.perf_counter_ns()
+        try:
+            return funkcja(self, *args, **kwargs)
+        finally:
+            self.pomiary.zapisz(nazwa, (time.perf_counter_ns() - start) / 1e6)
+    return opakowanie
@@ -0,0 +1,59 @@
+from collections import deque
+import threading
+
+from classes.Zapytania import WOLNE_OPASKI
+
+class PulaOpasek:
+    def __init__(self):
+        self.kolejka = deque()
+        self.wolne = set()
+        self.nieaktualna = False
+        # Kilka stanowisk może wydawać i przyjmować opaski jednocześnie
+        self._blokada = threading.RLock()
+
+    def zaladuj(self, conn):
+        # Zapytanie korzysta z częściowego indeksu idx_opaska_wolne
+        cursor = conn.cursor()
+        cursor.execute(WOLNE_OPASKI)
+        kolejka = deque(wiersz[0] for wiersz in cursor)
+        with self._blokada:
+            self.kolejka = kolejka
+            self.wolne = set(kolejka)
+            self.nieaktualna = False
+
+    def pobierz(self, conn):
+        with self._blokada:
+            numer = None if self.nieaktualna else self._pobierz_z_kolejki()
+            if numer is None:
+                # Pusta lub unieważniona pula - odbudowa z bazy. Wywołujący
+                # trzyma już blokadę zapisu, więc odczyt jest spójny.
+                self.zaladuj(conn)
+                numer = self._pobierz_z_kolejki()
+            return numer
+
+    def _pobierz_z_kolejki(self):
+        # Kolejka może zawierać numery już zajęte, pomijamy je leniwie
+        while self.kolejka:
+            numer = self.kolejka.popleft()
+            if numer in self.wolne:
+                self.wolne.discard(numer)
+                return numer
+        return None
+
+    def zajmij(self, numer):
+        with self._blokada:
+            self.wolne.discard(numer)
+
+    def zwroc(self, numer):
+        with self._blokada:
+            if numer not in self.wolne:
+                self.wolne.add(numer)
+                self.kolejka.append(numer)
+
+    def uniewaznij(self):
+        # Wymusza odbudowę puli z bazy przy następnym wydaniu opaski
+        with self._blokada:
+            self.nieaktualna = True
+
+    def __len__(self):
+        return len(self.wolne)
@@ -0,0 +1,77 @@
+import sqlite3
+import threading
+
+from classes.DziennikZapytan import PolaczenieSledzone
+from classes.Zapytania import ROZMIAR_PAMIECI_INSTRUKCJI, Polaczenie
+
+class PulaPolaczen:
+    def __init__(self, sciezka, rozmiar=4, limit_oczekiwania_ms=5000, prog_wolnych_zapytan_ms=None):
+        self.sciezka = sciezka
+        self.rozmiar = rozmiar
+        self.limit_oczekiwania_ms = limit_oczekiwania_ms
+        # None - bez pomiaru zapytań; inaczej wolniejsze trafiają do dziennika wolnych zapytań
+        self.prog_wolnych_zapytan_ms = prog_wolnych_zapytan_ms
+        self._wolne = []
+        self._otwarte = []
+        self._blokada = threading.Lock()
+        self._watek = threading.local()
+
+    def polaczenie(self):
+        """
+        Zwraca połączenie przypisane do bieżącego wątku. Przy pierwszym
+        użyciu w danym wątku połączenie pobierane jest z puli wolnych
+        albo otwierane na nowo.
+
+        Returns:
+            sqlite3.Connection: Połączenie bieżącego wątku
+        """
+        conn = getattr(self._watek, "conn", None)
+        if conn is None:
+            with self._blokada:
+                conn = self._wolne.pop() if self._wolne else None
+            if conn is None:
+                conn = self._otworz()
+            self._watek.conn = conn
+        return conn
+
+    def _otworz(self):
+        # check_same_thread=False - połączenie może wrócić do puli i trafić do innego wątku
+        conn = sqlite3.connect(
+            self.sciezka,
+            timeout=self.limit_oczekiwania_ms / 1000,
+            check_same_thread=False,
+            factory=Polaczenie if self.prog_wolnych_zapytan_ms is None else PolaczenieSledzone,
+            cached_statements=ROZMIAR_PAMIECI_INSTRUKCJI
+        )
+        if self.prog_wolnych_zapytan_ms is not None:
+            conn.prog_ms = self.prog_wolnych_zapytan_ms
+        # WAL pozwala czytać równolegle z zapisem innego stanowiska
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(f"PRAGMA busy_timeout={int(self.limit_oczekiwania_ms)}")
+        with self._blokada:
+            self._otwarte.append(conn)
+        return conn
+
+    def zwolnij(self):
+        # Oddaje połączenie bieżącego wątku do puli (np. po zakończeniu zadania w tle)
+        conn = getattr(self._watek, "conn", None)
+        if conn is None:
+            return
+        self._watek.conn = None
+        if conn.in_transaction:
+            conn.rollback()
+
+        with self._blokada:
+            if len(self._wolne) < self.rozmiar:
+                self._wolne.append(conn)
+                return
+            self._otwarte.remove(conn)
+        conn.close()
+
+    def zamknij(self):
+        with self._blokada:
+            for conn in self._otwarte:
+                conn.close()
+            self._otwarte = []
+            self._wolne = []
+        self._watek = threading.local()
@@ -1,43 +1,206 @@
 import csv
+import gzip
+import io
+import json
+import os
+import sqlite3
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+from classes.Zapytania import RAPORT_FINANSOWY, RAPORT_STATYSTYCZNY
+
+def zakres_dni(data_od, data_do):
+    """
+    Zamienia włącznie podany zakres dni na przedział półotwarty
+    [dzień od, dzień po dniu do), który SQLite może przeszukać indeksem
+    po kolumnie data zamiast wyliczać DATE(data) dla każdego wiersza.
+
+    Args:
+        data_od (str): Pierwszy dzień zakresu ("RRRR-MM-DD", ewentualnie z godziną)
+        data_do (str): Ostatni dzień zakresu ("RRRR-MM-DD", ewentualnie z godziną)
+
+    Returns:
+        tuple: (początek włącznie, koniec wyłącznie) jako "RRRR-MM-DD"
+    """
+    poczatek = datetime.strptime(data_od[:10], "%Y-%m-%d")
+    koniec = datetime.strptime(data_do[:10], "%Y-%m-%d") + timedelta(days=1)
+    return poczatek.strftime("%Y-%m-%d"), koniec.strftime("%Y-%m-%d")
+
+class RaportAnulowany(Exception):
+    """Generowanie raportu zostało przerwane na żądanie użytkownika."""
 
 class Raport:
+    # Liczba wierszy pobieranych z kursora naraz przy strumieniowaniu raportu
+    ROZMIAR_PACZKI = 1000
+    # Co tyle instrukcji maszyny wirtualnej SQLite zapytanie sprawdza anulowanie
+    KROKI_SPRAWDZANIA_ANULOWANIA = 10000
+
+    # Format eksportu -> (rozszerzenie pliku, kompresja gzip)
+    FORMATY_EKSPORTU = {
+        "csv": (".csv", False),
+        "csv.gz": (".csv.gz", True),
+        "jsonl": (".jsonl", False),
+        "jsonl.gz": (".jsonl.gz", True),
+    }
+    # Poziom 1 zapisuje zbliżonym tempem do zwykłego CSV, a plik jest
+    # tylko o kilkanaście procent większy niż przy domyślnym poziomie 9
+    POZIOM_KOMPRESJI = 1
+
+    # Nagłówki kolumn CSV i klucze rekordów JSON Lines
+    KOLUMNY = {
+        "finansowy": (["Data", "Metoda płatności", "Łączna kwota"], ["data", "metoda_platnosci", "laczna_kwota"]),
+        "statystyki": (["ID klienta", "Łączna kwota wydana"], ["klient_id", "wydane"]),
+    }
+
     def __init__(self, data, typ_raportu):
         self.data = data
         self.typRaportu = typ_raportu
 
     def generuj_raport(self, data_od, data_do, conn):
-        if self.typRaportu == "finansowy":
-            return self._generuj_raport_finansowy(data_od, data_do, conn)
-        elif self.typRaportu == "statystyki":
-            return self._generuj_raport_statystyczny(data_od, data_do, conn)
-        return None
+        if self.typRaportu not in ("finansowy", "statystyki"):
+            return None
+        return list(self.strumieniuj_raport(data_od, data_do, conn))
+
+    def strumieniuj_raport(self, data_od, data_do, conn, rozmiar_paczki=None, anulowanie=None):
+        """
+        Zwraca wiersze raportu jako generator pobierający dane z kursora
+        paczkami, dzięki czemu zużycie pamięci nie zależy od zakresu dat.
+
+        Args:
+            data_od (str): Pierwszy dzień raportu
+            data_do (str): Ostatni dzień raportu
+            conn (sqlite3.Connection): Połączenie z bazą danych
+            rozmiar_paczki (int): Liczba wierszy na jedno fetchmany
+            anulowanie (threading.Event): Flaga, przy której zapytanie
+                przerwane przez przerywalne_zapytania zgłasza RaportAnulowany
+
+        Yields:
+            tuple: Kolejne wiersze raportu
+        """
+        try:
+            if self.typRaportu == "finansowy":
+                cursor = self._zapytanie_finansowe(data_od, data_do, conn)
+            elif self.typRaportu == "statystyki":
+                cursor = self._zapytanie_statystyczne(data_od, data_do, conn)
+            else:
+                return
+
+            rozmiar_paczki = rozmiar_paczki or self.ROZMIAR_PACZKI
+            while True:
+                paczka = cursor.fetchmany(rozmiar_paczki)
+                if not paczka:
+                    break
+                yield from paczka
+        except sqlite3.OperationalError:
+            # Zapytanie przerwane przez procedurę postępu ("interrupted")
+            if anulowanie is not None and anulowanie.is_set():
+                raise RaportAnulowany() from None
+            raise
+
+    @contextmanager
+    def przerywalne_zapytania(self, conn, anulowanie):
+        """
+        Pozwala przerwać zapytanie raportu jeszcze przed pierwszym wierszem,
+        np. w trakcie długiego GROUP BY: SQLite co KROKI_SPRAWDZANIA_ANULOWANIA
+        instrukcji sprawdza flagę anulowanie i przerywa wykonanie.
+        """
+        if anulowanie is None:
+            yield
+            return
+        conn.set_progress_handler(anulowanie.is_set, self.KROKI_SPRAWDZANIA_ANULOWANIA)
+        try:
+            yield
+        finally:
+            conn.set_progress_handler(None, 0)
 
     def _generuj_raport_finansowy(self, data_od, data_do, conn):
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT DATE(data) AS dzien, metodaPlatnosci, SUM(kwota) AS laczna_kwota
-            FROM Transakcja
-            WHERE data BETWEEN ? AND ?
-            GROUP BY dzien, metodaPlatnosci
-            ORDER BY dzien, metodaPlatnosci
-        """, (data_od, data_do))
-        return cursor.fetchall()
+        return self._zapytanie_finansowe(data_od, data_do, conn).fetchall()
 
     def _generuj_raport_statystyczny(self, data_od, data_do, conn):
+        return self._zapytanie_statystyczne(data_od, data_do, conn).fetchall()
+
+    def _zapytanie_finansowe(self, data_od, data_do, conn):
         cursor = conn.cursor()
-        cursor.execute("""
-            SELECT t.klient_id, SUM(t.kwota) AS wydane
-            FROM Transakcja t
-            WHERE DATE(t.data) BETWEEN ? AND ?
-            GROUP BY t.klient_id
-        """, (data_od, data_do))
-        return cursor.fetchall()
-
-    def eksportuj_dane(self, dane, nazwa_pliku):
-        with open(nazwa_pliku, mode="w", newline="", encoding="utf-8") as file:
-            writer = csv.writer(file)
-            if self.typRaportu == "finansowy":
-                writer.writerow(["Data", "Metoda płatności", "Łączna kwota"])
-            else:
-                writer.writerow(["ID klienta", "Łączna kwota wydana"])
-            writer.writerows(dane)
\ No newline at end of file
+        cursor.execute(RAPORT_FINANSOWY, zakres_dni(data_od, data_do))
+        return cursor
+
+    def _zapytanie_statystyczne(self, data_od, data_do, conn):
+        cursor = conn.cursor()
+        cursor.execute(RAPORT_STATYSTYCZNY, zakres_dni(data_od, data_do))
+        return cursor
+
+    def nazwa_pliku(self, data_od, data_do, format_pliku="csv"):
+        if format_pliku not in self.FORMATY_EKSPORTU:
+            raise ValueError(f"Nieobsługiwany format pliku: {format_pliku}")
+        rozszerzenie, _ = self.FORMATY_EKSPORTU[format_pliku]
+        return f"raport_{self.typRaportu}_{data_od}_do_{data_do}{rozszerzenie}"
+
+    def eksportuj_dane(self, dane, nazwa_pliku, postep=None, anulowanie=None, format_pliku="csv"):
+        """
+        Zapisuje wiersze raportu do pliku CSV lub JSON Lines, opcjonalnie
+        skompresowanego gzipem. Dane mogą być dowolnym iterowalnym obiektem,
+        w tym generatorem ze strumieniuj_raport - wiersze trafiają do pliku
+        na bieżąco, bez gromadzenia w pamięci.
+
+        Args:
+            dane (iterable): Wiersze raportu
+            nazwa_pliku (str): Ścieżka pliku wynikowego
+            postep (callable): Wywoływane co ROZMIAR_PACZKI wierszy jako
+                postep(liczba_wierszy, zapisane_bajty)
+            anulowanie (threading.Event): Ustawione przerywa eksport
+            format_pliku (str): Klucz z FORMATY_EKSPORTU
+
+        Returns:
+            int: Liczba zapisanych wierszy danych
+
+        Raises:
+            ValueError: Dla nieobsługiwanego formatu pliku
+            RaportAnulowany: Gdy ustawiono anulowanie; niepełny plik jest usuwany
+        """
+        if format_pliku not in self.FORMATY_EKSPORTU:
+            raise ValueError(f"Nieobsługiwany format pliku: {format_pliku}")
+        _, kompresja = self.FORMATY_EKSPORTU[format_pliku]
+        naglowki, klucze = self.KOLUMNY.get(self.typRaportu, self.KOLUMNY["statystyki"])
+
+        liczba_wierszy = 0
+        try:
+            with open(nazwa_pliku, mode="wb") as plik:
+                strumien = plik
+                if kompresja:
+                    strumien = gzip.GzipFile(fileobj=plik, mode="wb", compresslevel=self.POZIOM_KOMPRESJI)
+                with strumien, io.TextIOWrapper(strumien, encoding="utf-8", newline="") as file:
+                    if format_pliku.startswith("jsonl"):
+                        zapisz = self._zapisywacz_jsonl(file, klucze)
+                    else:
+                        zapisz = self._zapisywacz_csv(file, naglowki)
+                    for wiersz in dane:
+                        zapisz(wiersz)
+                        liczba_wierszy += 1
+                        if liczba_wierszy % self.ROZMIAR_PACZKI == 0:
+                            if anulowanie is not None and anulowanie.is_set():
+                                raise RaportAnulowany()
+                            if postep is not None:
+                                # Pozycja w pliku na dysku - po kompresji, bez opróżniania buforów
+                                postep(liczba_wierszy, plik.tell())
+                    if anulowanie is not None and anulowanie.is_set():
+                        raise RaportAnulowany()
+        except RaportAnulowany:
+            os.remove(nazwa_pliku)
+            raise
+
+        if postep is not None:
+            postep(liczba_wierszy, os.path.getsize(nazwa_pliku))
+        return liczba_wierszy
+
+    def _zapisywacz_csv(self, file, naglowki):
+        writer = csv.writer(file)
+        writer.writerow(naglowki)
+        return writer.writerow
+
+    def _zapisywacz_jsonl(self, file, klucze):
+        koder = json.JSONEncoder(ensure_ascii=False)
+
+        def zapisz(wiersz):
+            file.write(koder.encode(dict(zip(klucze, wiersz))))
+            file.write("\n")
+        return zapisz
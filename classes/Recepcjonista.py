@@ -1,6 +1,7 @@
 from datetime import datetime
 from classes.OpaskaNFC import *
 from classes.Raport import *
+from classes.Zapytania import PIERWSZA_WOLNA_OPASKA
 
 class Recepcjonista:
     def __init__(self, identyfikator, login, imie, nazwisko, stanowisko):
@@ -10,23 +11,41 @@ class Recepcjonista:
         self.nazwisko = nazwisko
         self.stanowisko = stanowisko
 
-    def wydaj_opaske_nfc(self, klient, conn):
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT numerSeryjny FROM Opaska 
-            WHERE klient_id IS NULL
-            LIMIT 1
-        """)
-        wynik = cursor.fetchone()
-        if wynik:
-            opaska = OpaskaNFC(wynik[0])
-            opaska.aktywuj(klient, conn)
-            return opaska
-        return None
+    def wydaj_opaske_nfc(self, klient, conn, pula=None, czas=None):
+        while True:
+            if pula is not None:
+                numer = pula.pobierz(conn)
+            else:
+                cursor = conn.cursor()
+                cursor.execute(PIERWSZA_WOLNA_OPASKA)
+                wynik = cursor.fetchone()
+                numer = wynik[0] if wynik else None
+
+            if numer is None:
+                return None
+
+            opaska = OpaskaNFC(numer)
+            try:
+                if opaska.aktywuj(klient, conn, pula, czas):
+                    return opaska
+            except Exception:
+                if pula is not None:
+                    pula.zwroc(numer)
+                raise
+
+            # Opaskę wydało lub wycofało inne stanowisko - pula tego procesu jest
+            # nieaktualna. Wywołujący trzyma blokadę zapisu, więc po odbudowie
+            # puli z bazy kolejna próba trafi na wolną opaskę.
+            if pula is not None:
+                pula.uniewaznij()
 
     def przyjmij_platnosc(self, transakcja, conn):
         return transakcja.przetworz_platnosc(conn)
 
-    def generuj_raport(self, typ_raportu, data_od, data_do, conn):
-        raport = Raport(datetime.now().strftime("%Y-%m-%d"), typ_raportu)
-        return raport.generuj_raport(data_od, data_do, conn)
\ No newline at end of file
+    def generuj_raport(self, typ_raportu, data_od, data_do, conn, czas=None):
+        raport = Raport((czas or datetime.now()).strftime("%Y-%m-%d"), typ_raportu)
+        return raport.generuj_raport(data_od, data_do, conn)
+
+    def strumieniuj_raport(self, typ_raportu, data_od, data_do, conn, rozmiar_paczki=None, anulowanie=None, czas=None):
+        raport = Raport((czas or datetime.now()).strftime("%Y-%m-%d"), typ_raportu)
+        return raport.strumieniuj_raport(data_od, data_do, conn, rozmiar_paczki, anulowanie)
\ No newline at end of file
@@ -0,0 +1,201 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+import heapq
+import itertools
+import threading
+import time
+
+import numpy as np
+
+from classes.GeneratorDanych import ROZKLAD_GODZIN_WEEKEND
+
+OPERACJA_WEJSCIE = "obsluz_wejscie"
+OPERACJA_WYJSCIE = "obsluz_wyjscie"
+OPERACJA_PULPIT = "odswiez_pulpit"
+OPERACJA_RAPORT = "obsluz_raport"
+
+
+class ZegarSymulacji:
+    """
+    Zegar podstawiany do SystemObslugi. Każdy wątek stanowiska ma własny
+    czas symulacji - ustawiany na czas obsługiwanego zdarzenia.
+    """
+
+    def __init__(self, czas):
+        self.czas = czas
+        self._watek = threading.local()
+
+    def ustaw(self, czas):
+        self._watek.czas = czas
+
+    def __call__(self):
+        return getattr(self._watek, "czas", self.czas)
+
+
+class Symulator:
+    def __init__(self, system, zegar, dzien, ziarno=None,
+                 przyjscia_na_godzine=300, rozklad_godzin=ROZKLAD_GODZIN_WEEKEND,
+                 sredni_pobyt_min=90, stanowiska=4,
+                 okres_odswiezania_s=60, okres_raportow_s=3600, przyspieszenie=None):
+        """
+        Symulacja zdarzeń dyskretnych jednego dnia pracy pływalni.
+
+        Args:
+            system (SystemObslugi): System z zegarem zegar i zalogowanym pracownikiem
+            zegar (ZegarSymulacji): Zegar podstawiony do systemu
+            dzien (date): Symulowany dzień
+            ziarno (int): Ziarno generatora liczb losowych
+            przyjscia_na_godzine (float): Liczba wejść w najbardziej obleganej godzinie
+            rozklad_godzin (sequence): Względne natężenie wejść w 24 godzinach doby
+            sredni_pobyt_min (float): Średnia długość pobytu w minutach
+            stanowiska (int): Liczba równolegle pracujących stanowisk recepcji
+            okres_odswiezania_s (int): Co ile sekund każde stanowisko odświeża pulpit
+            okres_raportow_s (int): Co ile sekund generowany jest raport
+            przyspieszenie (float): Ile sekund symulacji przypada na sekundę
+                rzeczywistą; None - zdarzenia wykonywane bez przerw
+        """
+        self.system = system
+        self.zegar = zegar
+        self.poczatek = datetime.combine(dzien, datetime.min.time())
+        self.rng = np.random.default_rng(ziarno)
+        rozklad = np.asarray(rozklad_godzin, dtype=np.float64)
+        self.natezenie = przyjscia_na_godzine * rozklad / rozklad.max()
+        self.sredni_pobyt_min = sredni_pobyt_min
+        self.stanowiska = stanowiska
+        self.okres_odswiezania_s = okres_odswiezania_s
+        self.okres_raportow_s = okres_raportow_s
+        self.przyspieszenie = przyspieszenie
+
+        self._zdarzenia = []
+        self._kolejny = itertools.count()
+        self._warunek = threading.Condition()
+        self._w_toku = 0
+        self.pomiary = {}
+        self.oczekiwanie_na_blokade = []
+        self.odrzucone_wejscia = 0
+
+    def _zaplanuj(self, sekunda, operacja, *argumenty):
+        with self._warunek:
+            heapq.heappush(self._zdarzenia, (sekunda, next(self._kolejny), operacja, argumenty))
+            self._warunek.notify_all()
+
+    def _zaplanuj_dzien(self, klienci):
+        godziny_otwarcia = np.flatnonzero(self.natezenie)
+        for godzina in godziny_otwarcia:
+            # Niejednorodny proces Poissona - stałe natężenie w obrębie godziny
+            liczba = self.rng.poisson(self.natezenie[godzina])
+            for sekunda in np.sort(self.rng.uniform(godzina * 3600, (godzina + 1) * 3600, liczba)):
+                klient = klienci[self.rng.integers(0, len(klienci))]
+                self._zaplanuj(float(sekunda), OPERACJA_WEJSCIE, klient)
+
+        otwarcie, zamkniecie = godziny_otwarcia[0] * 3600, (godziny_otwarcia[-1] + 1) * 3600
+        for stanowisko in range(self.stanowiska):
+            przesuniecie = self.okres_odswiezania_s * stanowisko / self.stanowiska
+            for sekunda in np.arange(otwarcie + przesuniecie, zamkniecie, self.okres_odswiezania_s):
+                self._zaplanuj(float(sekunda), OPERACJA_PULPIT)
+        for sekunda in np.arange(otwarcie + self.okres_raportow_s, zamkniecie + 1, self.okres_raportow_s):
+            self._zaplanuj(float(sekunda), OPERACJA_RAPORT)
+
+    def _wykonaj(self, sekunda, operacja, argumenty):
+        czas = self.poczatek + timedelta(seconds=sekunda)
+        self.zegar.ustaw(czas)
+        self.system.pobierz_oczekiwanie_na_blokade()
+
+        start = time.perf_counter()
+        if operacja == OPERACJA_WEJSCIE:
+            imie, nazwisko, wiek, pesel = argumenty[0]
+            wynik = self.system.obsluz_wejscie(imie, nazwisko, wiek, pesel)
+        elif operacja == OPERACJA_WYJSCIE:
+            wynik = self.system.obsluz_wyjscie(argumenty[0], "Karta")
+        elif operacja == OPERACJA_PULPIT:
+            wynik = (self.system.monitoruj_status(), self.system.pobierz_statystyki())
+        else:
+            dzien = czas.strftime("%Y-%m-%d")
+            wynik = self.system.obsluz_raport("finansowy", czas.replace(day=1).strftime("%Y-%m-%d"), dzien)
+        czas_trwania = time.perf_counter() - start
+        oczekiwanie = self.system.pobierz_oczekiwanie_na_blokade()
+
+        if operacja == OPERACJA_WEJSCIE:
+            if wynik.startswith("Pomyślnie"):
+                # Wyjście planowane po wydaniu opaski, bo dopiero wtedy znamy jej numer
+                numer_opaski = wynik.rsplit(" ", 1)[-1]
+                pobyt_s = max(900.0, self.rng.gamma(2.0, self.sredni_pobyt_min * 30))
+                self._zaplanuj(sekunda + pobyt_s, OPERACJA_WYJSCIE, numer_opaski)
+            else:
+                with self._warunek:
+                    self.odrzucone_wejscia += 1
+
+        with self._warunek:
+            self.pomiary.setdefault(operacja, []).append(czas_trwania)
+            if operacja in (OPERACJA_WEJSCIE, OPERACJA_WYJSCIE):
+                self.oczekiwanie_na_blokade.append(oczekiwanie)
+
+    def _zadanie(self, sekunda, operacja, argumenty):
+        try:
+            self._wykonaj(sekunda, operacja, argumenty)
+        finally:
+            # Połączenie stanowiska wraca do puli po każdym zdarzeniu
+            if self.system.pula_polaczen is not None:
+                self.system.pula_polaczen.zwolnij()
+            with self._warunek:
+                self._w_toku -= 1
+                self._warunek.notify_all()
+
+    def uruchom(self, klienci):
+        """
+        Odtwarza dzień pracy: wejścia klientów, ich wyjścia po losowym
+        czasie pobytu, odświeżanie pulpitów i okresowe raporty. Zdarzenia
+        wykonywane są przez pulę wątków - po jednym na stanowisko.
+
+        Args:
+            klienci (list): Krotki (imie, nazwisko, wiek, pesel) losowanych klientów
+
+        Returns:
+            dict: Przepustowość, percentyle czasu operacji i czas oczekiwania na blokadę
+        """
+        self._zaplanuj_dzien(klienci)
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.stanowiska, thread_name_prefix="stanowisko") as wykonawca:
+            while True:
+                with self._warunek:
+                    # Wyjścia dokładane są w trakcie, więc koniec dopiero gdy nic nie jest w toku
+                    while not self._zdarzenia and self._w_toku:
+                        self._warunek.wait()
+                    if not self._zdarzenia:
+                        break
+                    # Nie wyprzedzamy zdarzeń w toku o więcej niż pulę stanowisk
+                    while self._w_toku >= self.stanowiska * 2:
+                        self._warunek.wait()
+                    sekunda, _, operacja, argumenty = heapq.heappop(self._zdarzenia)
+                    self._w_toku += 1
+
+                if self.przyspieszenie:
+                    opoznienie = sekunda / self.przyspieszenie - (time.perf_counter() - start)
+                    if opoznienie > 0:
+                        time.sleep(opoznienie)
+                wykonawca.submit(self._zadanie, sekunda, operacja, argumenty)
+        return self.podsumuj(time.perf_counter() - start)
+
+    def podsumuj(self, czas_rzeczywisty):
+        operacje = {}
+        for operacja, czasy in self.pomiary.items():
+            czasy_ms = np.array(czasy) * 1000
+            operacje[operacja] = {
+                "liczba": len(czasy),
+                "przepustowosc_na_s": round(len(czasy) / czas_rzeczywisty, 1),
+                "p50_ms": round(float(np.percentile(czasy_ms, 50)), 3),
+                "p99_ms": round(float(np.percentile(czasy_ms, 99)), 3),
+                "maks_ms": round(float(czasy_ms.max()), 3),
+            }
+        oczekiwanie_ms = np.array(self.oczekiwanie_na_blokade or [0.0]) * 1000
+        return {
+            "czas_rzeczywisty_s": round(czas_rzeczywisty, 2),
+            "zdarzenia": sum(len(czasy) for czasy in self.pomiary.values()),
+            "odrzucone_wejscia": self.odrzucone_wejscia,
+            "operacje": operacje,
+            "oczekiwanie_na_blokade": {
+                "suma_ms": round(float(oczekiwanie_ms.sum()), 3),
+                "p50_ms": round(float(np.percentile(oczekiwanie_ms, 50)), 3),
+                "p99_ms": round(float(np.percentile(oczekiwanie_ms, 99)), 3),
+            },
+        }
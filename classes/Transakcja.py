@@ -1,3 +1,5 @@
+from classes.Zapytania import DODAJ_TRANSAKCJE, ZAKSIEGUJ_PRZYCHOD_DZIENNY, kursor
+
 class Transakcja:
     def __init__(self, kwota, data, metoda_platnosci, klient_id, pracownik_id):
         self.kwota = kwota
@@ -7,23 +9,22 @@ class Transakcja:
         self.pracownik_id = pracownik_id
 
     def przetworz_platnosc(self, conn):
-        cursor = conn.cursor()
-        cursor.execute("""
-            INSERT INTO Transakcja 
-            (kwota, data, metodaPlatnosci, klient_id, pracownik_id)
-            VALUES (?, ?, ?, ?, ?)
-        """, (self.kwota, self.data,
+        cursor = kursor(conn)
+        cursor.execute(DODAJ_TRANSAKCJE, (self.kwota, self.data,
               self.metodaPlatnosci, self.klient_id, self.pracownik_id))
-        conn.commit()
         self.identyfikatorTransakcji = cursor.lastrowid
+
+        # Agregat dzienny aktualizowany w tej samej transakcji co płatność
+        cursor.execute(ZAKSIEGUJ_PRZYCHOD_DZIENNY, (self.data[:10], self.metodaPlatnosci, self.kwota))
         return True
 
-    def wydrukuj_paragon(self):
-        with open('paragon.txt', 'w', encoding='utf-8') as plik:
-            plik.write("========================\n")
-            plik.write("Pływalnia - Paragon\n")
-            plik.write(f"ID Transakcji: {self.identyfikatorTransakcji or "BŁĄD"}\n")
-            plik.write(f"Data: {self.data}\n")
-            plik.write(f"Kwota: {self.kwota} zł\n")
-            plik.write(f"Metoda płatności: {self.metodaPlatnosci}\n")
-            plik.write("========================\n")
\ No newline at end of file
+    def tresc_paragonu(self):
+        return (
+            "========================\n"
+            "Pływalnia - Paragon\n"
+            f"ID Transakcji: {self.identyfikatorTransakcji or "BŁĄD"}\n"
+            f"Data: {self.data}\n"
+            f"Kwota: {self.kwota} zł\n"
+            f"Metoda płatności: {self.metodaPlatnosci}\n"
+            "========================\n"
+        )
\ No newline at end of file
@@ -0,0 +1,268 @@
+import sqlite3
+
+# Wszystkie zapytania SQL systemu. Stałe teksty zapytań pozwalają
+# połączeniu ponownie używać przygotowanych instrukcji z pamięci
+# podręcznej, a strojenie zapytania (indeks, podpowiedź) odbywa się
+# w jednym miejscu.
+
+# Liczba przygotowanych instrukcji pamiętanych przez połączenie;
+# z zapasem ponad liczbę zapytań w tym module
+ROZMIAR_PAMIECI_INSTRUKCJI = 256
+
+# --- Schemat ---
+
+SCHEMAT = (
+    """
+    CREATE TABLE IF NOT EXISTS Klient (
+        identyfikator INTEGER PRIMARY KEY,
+        imie TEXT NOT NULL,
+        nazwisko TEXT NOT NULL,
+        wiek INTEGER NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS Pracownik (
+        identyfikator INTEGER PRIMARY KEY AUTOINCREMENT,
+        login TEXT NOT NULL UNIQUE,
+        haslo TEXT NOT NULL,
+        imie TEXT NOT NULL,
+        nazwisko TEXT NOT NULL,
+        stanowisko TEXT NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS Opaska (
+        numerSeryjny INTEGER PRIMARY KEY,
+        czasWejscia TEXT,
+        czasWyjscia TEXT,
+        klient_id INTEGER,
+        FOREIGN KEY (klient_id) REFERENCES Klient(identyfikator)
+    )
+    """,
+    # Częściowy indeks zawierający wyłącznie wolne opaski
+    """
+    CREATE INDEX IF NOT EXISTS idx_opaska_wolne
+    ON Opaska (numerSeryjny) WHERE klient_id IS NULL
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS Transakcja (
+        identyfikatorTransakcji INTEGER PRIMARY KEY AUTOINCREMENT,
+        kwota REAL NOT NULL,
+        data TEXT NOT NULL,
+        metodaPlatnosci TEXT NOT NULL,
+        klient_id INTEGER,
+        pracownik_id INTEGER,
+        FOREIGN KEY (klient_id) REFERENCES Klient(identyfikator),
+        FOREIGN KEY (pracownik_id) REFERENCES Pracownik(identyfikator)
+    )
+    """,
+    # Indeksy pokrywające dla raportów i statystyk filtrowanych po dacie
+    """
+    CREATE INDEX IF NOT EXISTS idx_transakcja_data_klient
+    ON Transakcja (data, klient_id, kwota)
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_transakcja_klient
+    ON Transakcja (klient_id, data, kwota)
+    """,
+    # Przychody zagregowane per dzień i metoda płatności
+    """
+    CREATE TABLE IF NOT EXISTS PrzychodDzienny (
+        dzien TEXT NOT NULL,
+        metodaPlatnosci TEXT NOT NULL,
+        suma REAL NOT NULL DEFAULT 0,
+        liczba INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (dzien, metodaPlatnosci)
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS Raport (
+        identyfikatorRaportu INTEGER PRIMARY KEY AUTOINCREMENT,
+        data TEXT NOT NULL,
+        typRaportu TEXT NOT NULL,
+        pracownik_id INTEGER,
+        FOREIGN KEY (pracownik_id) REFERENCES Pracownik(identyfikator)
+    )
+    """,
+)
+
+# Indeksy transakcji usuwane na czas masowego ładowania danych
+# i odtwarzane przez SCHEMAT
+USUN_INDEKSY_TRANSAKCJI = (
+    "DROP INDEX IF EXISTS idx_transakcja_data_klient",
+    "DROP INDEX IF EXISTS idx_transakcja_klient",
+)
+
+# --- Pracownik ---
+
+PRACOWNIK_PO_LOGINIE = """
+    SELECT identyfikator, login, haslo, imie, nazwisko, stanowisko
+    FROM Pracownik WHERE login = ?
+"""
+LICZBA_PRACOWNIKOW_O_LOGINIE = "SELECT COUNT(*) FROM Pracownik WHERE login = ?"
+DODAJ_PRACOWNIKA = "INSERT INTO Pracownik (login, haslo, imie, nazwisko, stanowisko) VALUES (?, ?, ?, ?, ?)"
+DODAJ_PRACOWNIKA_Z_IDENTYFIKATOREM = """
+    INSERT INTO Pracownik (identyfikator, login, haslo, imie, nazwisko, stanowisko) VALUES (?, ?, ?, ?, ?, ?)
+"""
+ZMIEN_HASLO_PRACOWNIKA = "UPDATE Pracownik SET haslo = ? WHERE identyfikator = ?"
+IMIE_I_NAZWISKO_PRACOWNIKA = "SELECT imie, nazwisko FROM Pracownik WHERE identyfikator = ?"
+USUN_PRACOWNIKA = "DELETE FROM Pracownik WHERE identyfikator = ?"
+LISTA_PRACOWNIKOW = "SELECT identyfikator, login, imie, nazwisko, stanowisko FROM Pracownik"
+
+# --- Klient ---
+
+LICZBA_KLIENTOW = "SELECT COUNT(*) FROM Klient"
+KLIENT_ISTNIEJE = "SELECT 1 FROM Klient WHERE identyfikator = ?"
+DODAJ_KLIENTA = "INSERT INTO Klient (identyfikator, imie, nazwisko, wiek) VALUES (?, ?, ?, ?)"
+ZAPISZ_KLIENTA = "INSERT OR REPLACE INTO Klient (identyfikator, imie, nazwisko, wiek) VALUES (?, ?, ?, ?)"
+# Aktualizacja w miejscu zamiast REPLACE - bez usuwania i ponownego wstawiania wiersza
+IMPORTUJ_KLIENTA = """
+    INSERT INTO Klient (identyfikator, imie, nazwisko, wiek) VALUES (?, ?, ?, ?)
+    ON CONFLICT(identyfikator) DO UPDATE SET
+        imie = excluded.imie, nazwisko = excluded.nazwisko, wiek = excluded.wiek
+"""
+
+# --- Opaska ---
+
+LICZBA_AKTYWNYCH_OPASEK = "SELECT COUNT(*) FROM Opaska WHERE klient_id IS NOT NULL"
+# Oba zapytania korzystają z częściowego indeksu idx_opaska_wolne
+WOLNE_OPASKI = """
+    SELECT numerSeryjny FROM Opaska
+    WHERE klient_id IS NULL
+    ORDER BY numerSeryjny
+"""
+PIERWSZA_WOLNA_OPASKA = """
+    SELECT numerSeryjny FROM Opaska
+    WHERE klient_id IS NULL
+    LIMIT 1
+"""
+AKTYWNA_OPASKA = """
+    SELECT o.numerSeryjny, o.czasWejscia, o.klient_id, k.imie, k.nazwisko
+    FROM Opaska o
+    JOIN Klient k ON o.klient_id = k.identyfikator
+    WHERE o.numerSeryjny = ? AND o.czasWyjscia IS NULL
+"""
+# Warunek klient_id IS NULL - opaska mogła zostać wydana lub wycofana na innym stanowisku
+AKTYWUJ_OPASKE = """
+    UPDATE Opaska
+    SET czasWejscia = ?, czasWyjscia = NULL, klient_id = ?
+    WHERE numerSeryjny = ? AND klient_id IS NULL
+"""
+DEAKTYWUJ_OPASKE = """
+    UPDATE Opaska
+    SET czasWyjscia = ?, klient_id = NULL
+    WHERE numerSeryjny = ?
+"""
+DODAJ_OPASKE = "INSERT INTO Opaska (numerSeryjny, czasWejscia, czasWyjscia, klient_id) VALUES (?, ?, ?, ?)"
+# Pierwszy numer za istniejącymi opaskami; w pustej bazie numeracja od 1001
+NASTEPNY_NUMER_OPASKI = "SELECT COALESCE(MAX(numerSeryjny), 1000) + 1 FROM Opaska"
+DODAJ_WOLNA_OPASKE = """
+    INSERT OR IGNORE INTO Opaska (numerSeryjny, czasWejscia, czasWyjscia, klient_id) VALUES (?, NULL, NULL, NULL)
+"""
+LICZBA_OPASEK_W_UZYCIU_Z_ZAKRESU = """
+    SELECT COUNT(*) FROM Opaska WHERE numerSeryjny BETWEEN ? AND ? AND klient_id IS NOT NULL
+"""
+USUN_WOLNE_OPASKI_Z_ZAKRESU = "DELETE FROM Opaska WHERE numerSeryjny BETWEEN ? AND ? AND klient_id IS NULL"
+
+# --- Transakcja i przychody ---
+
+DODAJ_TRANSAKCJE = """
+    INSERT INTO Transakcja (kwota, data, metodaPlatnosci, klient_id, pracownik_id)
+    VALUES (?, ?, ?, ?, ?)
+"""
+# Agregat dzienny aktualizowany w tej samej transakcji co płatność
+ZAKSIEGUJ_PRZYCHOD_DZIENNY = """
+    INSERT INTO PrzychodDzienny (dzien, metodaPlatnosci, suma, liczba)
+    VALUES (?, ?, ?, 1)
+    ON CONFLICT (dzien, metodaPlatnosci)
+    DO UPDATE SET suma = suma + excluded.suma, liczba = liczba + 1
+"""
+PRZYCHODY_DZIENNE_DO_UZUPELNIENIA = """
+    SELECT NOT EXISTS (SELECT 1 FROM PrzychodDzienny)
+       AND EXISTS (SELECT 1 FROM Transakcja)
+"""
+USUN_PRZYCHODY_DZIENNE = "DELETE FROM PrzychodDzienny"
+ODBUDUJ_PRZYCHODY_DZIENNE = """
+    INSERT INTO PrzychodDzienny (dzien, metodaPlatnosci, suma, liczba)
+    SELECT substr(data, 1, 10), metodaPlatnosci, SUM(kwota), COUNT(*)
+    FROM Transakcja
+    GROUP BY substr(data, 1, 10), metodaPlatnosci
+"""
+PRZYCHOD_W_DNIU = """
+    SELECT COALESCE(SUM(suma), 0) FROM PrzychodDzienny
+    WHERE dzien = ?
+"""
+PRZYCHOD_W_OKRESIE = """
+    SELECT COALESCE(SUM(suma), 0) FROM PrzychodDzienny
+    WHERE dzien >= ? AND dzien < ?
+"""
+
+# --- Raport ---
+
+DODAJ_RAPORT = "INSERT INTO Raport (data, typRaportu, pracownik_id) VALUES (?, ?, ?)"
+RAPORT_FINANSOWY = """
+    SELECT dzien, metodaPlatnosci, suma AS laczna_kwota
+    FROM PrzychodDzienny
+    WHERE dzien >= ? AND dzien < ?
+    ORDER BY dzien, metodaPlatnosci
+"""
+# Zakres dat przeszukiwany indeksem pokrywającym idx_transakcja_data_klient;
+# grupowanie wymaga tymczasowego B-drzewa, ale tylko o rozmiarze liczby klientów
+RAPORT_STATYSTYCZNY = """
+    SELECT t.klient_id, SUM(t.kwota) AS wydane
+    FROM Transakcja t
+    WHERE t.data >= ? AND t.data < ?
+    GROUP BY t.klient_id
+"""
+
+# Zapytania z danymi wrażliwymi w parametrach (skróty haseł, loginy,
+# PESEL-e i dane klientów) - ich parametry nie trafiają do dziennika
+# wolnych zapytań
+ZAPYTANIA_Z_DANYMI_WRAZLIWYMI = frozenset({
+    PRACOWNIK_PO_LOGINIE,
+    LICZBA_PRACOWNIKOW_O_LOGINIE,
+    DODAJ_PRACOWNIKA,
+    DODAJ_PRACOWNIKA_Z_IDENTYFIKATOREM,
+    ZMIEN_HASLO_PRACOWNIKA,
+    KLIENT_ISTNIEJE,
+    DODAJ_KLIENTA,
+    ZAPISZ_KLIENTA,
+    IMPORTUJ_KLIENTA,
+    AKTYWUJ_OPASKE,
+    DODAJ_OPASKE,
+    DODAJ_TRANSAKCJE,
+})
+
+
+class Polaczenie(sqlite3.Connection):
+    """
+    Połączenie z jednym długo żyjącym kursorem dla krótkich zapytań
+    najczęstszych operacji (wejście, wyjście, status).
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._kursor = None
+
+    def kursor(self):
+        if self._kursor is None:
+            self._kursor = self.cursor()
+        return self._kursor
+
+
+def kursor(conn):
+    """
+    Zwraca długo żyjący kursor połączenia. Przeznaczony dla zapytań, których
+    wynik jest od razu w całości odczytywany (fetchone) - kolejne execute
+    na tym samym kursorze porzuca poprzedni wynik. Połączenia spoza puli
+    (np. w testach) dostają zwykły, nowy kursor.
+
+    Args:
+        conn (sqlite3.Connection): Połączenie z bazą danych
+
+    Returns:
+        sqlite3.Cursor: Kursor do wykonania zapytania
+    """
+    if isinstance(conn, Polaczenie):
+        return conn.kursor()
+    return conn.cursor()
@@ -0,0 +1,32 @@
+import argparse
+import time
+
+from SystemObslugi import SystemObslugi
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generuje syntetyczną bazę danych PoolPro do testów wydajności.")
+    parser.add_argument("sciezka", help="Ścieżka pliku bazy danych (tworzony, jeśli nie istnieje)")
+    parser.add_argument("--klienci", type=int, default=10000, help="Liczba klientów")
+    parser.add_argument("--opaski", type=int, default=1000, help="Liczba wolnych opasek")
+    parser.add_argument("--transakcje", type=int, default=100000, help="Liczba transakcji")
+    parser.add_argument("--dni", type=int, default=365, help="Liczba dni historii transakcji")
+    parser.add_argument("--ziarno", type=int, default=None, help="Ziarno generatora dla powtarzalnych danych")
+    args = parser.parse_args()
+
+    system = SystemObslugi()
+    system.inicjalizuj_baze_danych(args.sciezka)
+    start = time.perf_counter()
+    try:
+        wynik = system.generuj_dane_testowe(args.klienci, args.opaski, args.transakcje, args.dni, args.ziarno)
+    finally:
+        system.zamknij()
+
+    print(
+        f"Wygenerowano {wynik['klienci']} klientów, {wynik['opaski']} opasek "
+        f"i {wynik['transakcje']} transakcji w {time.perf_counter() - start:.1f} s"
+    )
+
+
+if __name__ == "__main__":
+    main()
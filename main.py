@@ -1,14 +1,20 @@
 import sys
 import os
+import threading
 from datetime import datetime
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QVBoxLayout, QHBoxLayout, QPushButton, QLineEdit, QLabel,
     QDialog, QFormLayout, QWidget, QMessageBox, QComboBox,
-    QStackedWidget, QDateEdit, QFrame, QGridLayout, QTableWidget, QHeaderView, QTableWidgetItem
+    QStackedWidget, QDateEdit, QFrame, QGridLayout, QTableWidget, QHeaderView, QTableWidgetItem,
+    QProgressBar, QFileDialog
 )
-from PyQt6.QtCore import QTimer, QDate, Qt, QSize
+from PyQt6.QtCore import QTimer, QDate, Qt, QSize, QObject, QRunnable, QThreadPool, pyqtSignal
 from PyQt6.QtGui import QIcon
 from SystemObslugi import SystemObslugi
+from classes.DziennikZapytan import wlacz_dziennik_wolnych_zapytan
+from classes.MagistralaZdarzen import (
+    ZDARZENIE_KLIENT_ZAREJESTROWANY, ZDARZENIE_PLATNOSC_ZAREJESTROWANA, ZDARZENIE_OPASKA_ZWOLNIONA
+)
 
 ACCENT_COLOR = "#2979ff"
 BG_COLOR = "#f5f5f5"
@@ -16,6 +22,13 @@ CARD_BG = "#ffffff"
 TEXT_COLOR = "#333333"
 SECONDARY_TEXT = "#757575"
 
+REPORT_FORMATS = [
+    ("CSV", "csv"),
+    ("CSV (gzip)", "csv.gz"),
+    ("JSON Lines", "jsonl"),
+    ("JSON Lines (gzip)", "jsonl.gz"),
+]
+
 
 def validate_pesel(pesel):
     if not pesel.isdigit() or len(pesel) != 11:
@@ -23,6 +36,136 @@ def validate_pesel(pesel):
     return int(pesel)
 
 
+class WorkerSignals(QObject):
+    finished = pyqtSignal(object)
+    error = pyqtSignal(str)
+    done = pyqtSignal()
+
+
+class DatabaseTask(QRunnable):
+    def __init__(self, system, fn, *args):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.system = system
+        self.fn = fn
+        self.args = args
+        self.signals = WorkerSignals()
+
+    def run(self):
+        try:
+            result = self.fn(*self.args)
+        except Exception as e:
+            self.signals.error.emit(str(e))
+        else:
+            self.signals.finished.emit(result)
+        finally:
+            # Połączenie wątku wraca do puli, wątki QThreadPool są wygaszane
+            if self.system.pula_polaczen is not None:
+                self.system.pula_polaczen.zwolnij()
+            self.signals.done.emit()
+
+
+class ReportJob(QObject):
+    """
+    Postęp i anulowanie jednego raportu generowanego w tle. Postęp
+    zgłaszany z wątku roboczego trafia do GUI sygnałem progress.
+    """
+    progress = pyqtSignal(int, int)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.cancelled = threading.Event()
+
+    def report_progress(self, rows, bytes_written):
+        self.progress.emit(rows, bytes_written)
+
+    def cancel(self):
+        self.cancelled.set()
+
+
+class DomainEventBridge(QObject):
+    """
+    Przekazuje zdarzenia z MagistralaZdarzen do wątku GUI. Zdarzenia są
+    publikowane w wątkach roboczych, a sygnał dostarcza je kolejką Qt.
+    """
+    event_received = pyqtSignal(str, object)
+
+    def __init__(self, bus, event_types, parent=None):
+        super().__init__(parent)
+        self.bus = bus
+        self.event_types = event_types
+        for event_type in event_types:
+            bus.subskrybuj(event_type, self.forward)
+
+    def forward(self, event_type, data):
+        self.event_received.emit(event_type, data)
+
+    def close(self):
+        for event_type in self.event_types:
+            self.bus.odsubskrybuj(event_type, self.forward)
+
+
+class BackgroundService(QObject):
+    """
+    Wykonuje wywołania SystemObslugi poza wątkiem GUI i dostarcza
+    wyniki sygnałami z powrotem do wątku GUI.
+    """
+    # Długie zadania (raporty, import) mają osobną pulę - obsługa recepcji
+    # zawsze ma wolny wątek, nawet przy kilku raportach w toku
+    DESK_THREADS = 4
+    LONG_RUNNING_THREADS = 2
+
+    def __init__(self, system, parent=None):
+        super().__init__(parent)
+        self.system = system
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(self.DESK_THREADS)
+        self.long_running_pool = QThreadPool(self)
+        self.long_running_pool.setMaxThreadCount(self.LONG_RUNNING_THREADS)
+        self.tasks = set()
+        self.in_flight = set()
+        self.follow_ups = {}
+
+    def submit(self, fn, *args, on_result=None, on_error=None, on_done=None, long_running=False):
+        task = DatabaseTask(self.system, fn, *args)
+        if on_result:
+            task.signals.finished.connect(on_result)
+        if on_error:
+            task.signals.error.connect(on_error)
+        if on_done:
+            task.signals.done.connect(on_done)
+        task.signals.done.connect(lambda: self.tasks.discard(task))
+
+        self.tasks.add(task)
+        (self.long_running_pool if long_running else self.pool).start(task)
+        return task
+
+    def submit_coalesced(self, key, fn, *args, on_result=None):
+        """
+        Jak submit, ale dla danego klucza działa najwyżej jedno zadanie.
+        Zlecenia w trakcie jego trwania zastępują się nawzajem, więc po
+        wolnym zapytaniu wykonywane jest co najwyżej jedno kolejne.
+        """
+        if key in self.in_flight:
+            self.follow_ups[key] = (fn, args, on_result)
+            return
+
+        self.in_flight.add(key)
+        self.submit(fn, *args, on_result=on_result, on_done=lambda: self._coalesced_done(key))
+
+    def _coalesced_done(self, key):
+        self.in_flight.discard(key)
+        follow_up = self.follow_ups.pop(key, None)
+        if follow_up:
+            fn, args, on_result = follow_up
+            self.submit_coalesced(key, fn, *args, on_result=on_result)
+
+    def shutdown(self):
+        self.follow_ups.clear()
+        self.pool.waitForDone()
+        self.long_running_pool.waitForDone()
+
+
 class ModernButton(QPushButton):
     def __init__(self, text, icon_path=None, parent=None):
         super().__init__(text, parent)
@@ -307,13 +450,24 @@ class ClientRegistrationDialog(BaseDialog):
         try:
             wiek = int(self.wiek_input.text())
             pesel = validate_pesel(self.id_klienta_input.text())
-            message = self.parent().system.obsluz_wejscie(
-                self.imie_input.text(), self.nazwisko_input.text(), wiek, pesel
-            )
-            self.show_notification(QMessageBox.Icon.Information, "Rejestracja", message)
-            self.accept()
         except ValueError as e:
             self.show_notification(QMessageBox.Icon.Warning, "Błąd", str(e))
+            return
+
+        self.submit_button.setEnabled(False)
+        self.parent().service.submit(
+            self.parent().system.obsluz_wejscie,
+            self.imie_input.text(), self.nazwisko_input.text(), wiek, pesel,
+            on_result=self.on_finished, on_error=self.on_error
+        )
+
+    def on_finished(self, message):
+        self.show_notification(QMessageBox.Icon.Information, "Rejestracja", message)
+        self.accept()
+
+    def on_error(self, message):
+        self.submit_button.setEnabled(True)
+        self.show_notification(QMessageBox.Icon.Warning, "Błąd", message)
 
 
 class CheckoutDialog(BaseDialog):
@@ -365,12 +519,21 @@ class CheckoutDialog(BaseDialog):
 
     def submit(self):
         payment_method = self.metoda_platnosci_input.currentText().lower()
-        message = self.parent().system.obsluz_wyjscie(
-            self.numer_opaski_input.text(), payment_method
+        self.submit_button.setEnabled(False)
+        self.parent().service.submit(
+            self.parent().system.obsluz_wyjscie,
+            self.numer_opaski_input.text(), payment_method,
+            on_result=self.on_finished, on_error=self.on_error
         )
+
+    def on_finished(self, message):
         self.show_notification(QMessageBox.Icon.Information, "Wyjście klienta", message)
         self.accept()
 
+    def on_error(self, message):
+        self.submit_button.setEnabled(True)
+        self.show_notification(QMessageBox.Icon.Warning, "Błąd", message)
+
 
 class ReportDialog(BaseDialog):
     def __init__(self, parent=None):
@@ -393,9 +556,14 @@ class ReportDialog(BaseDialog):
         self.data_do_input.setDate(QDate.currentDate())
         self.data_od_input.setDate(QDate.currentDate().addDays(-30))
 
+        self.format_input = ModernComboBox(self)
+        for label, file_format in REPORT_FORMATS:
+            self.format_input.addItem(label, file_format)
+
         form_layout.addRow("Typ raportu:", self.typ_raportu_input)
         form_layout.addRow("Data od:", self.data_od_input)
         form_layout.addRow("Data do:", self.data_do_input)
+        form_layout.addRow("Format pliku:", self.format_input)
 
         button_layout = QHBoxLayout()
         self.cancel_button = ModernButton("Anuluj", None, self)
@@ -419,23 +587,78 @@ class ReportDialog(BaseDialog):
         
         form_card = CardWidget(self)
         form_card.setLayout(form_layout)
+
+        self.progress_bar = QProgressBar(self)
+        self.progress_bar.setRange(0, 0)
+        self.progress_bar.setTextVisible(False)
+        self.progress_bar.setVisible(False)
+
+        self.progress_label = QLabel("", self)
+        self.progress_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.progress_label.setStyleSheet(f"color: {SECONDARY_TEXT};")
         
         self.layout.addWidget(title_label)
         self.layout.addWidget(form_card)
+        self.layout.addWidget(self.progress_bar)
+        self.layout.addWidget(self.progress_label)
         self.layout.addLayout(button_layout)
 
+        self.job = None
+
     def submit(self):
         date_from = self.data_od_input.date().toString("yyyy-MM-dd")
         date_to = self.data_do_input.date().toString("yyyy-MM-dd")
         
-        message = self.parent().system.obsluz_raport(
+        self.submit_button.setEnabled(False)
+        self.cancel_button.setText("Przerwij")
+        self.progress_bar.setVisible(True)
+        self.progress_label.setText("Generowanie raportu...")
+
+        self.job = ReportJob(self)
+        self.job.progress.connect(self.on_progress)
+        self.parent().service.submit(
+            self.parent().system.obsluz_raport,
             self.typ_raportu_input.currentText().lower(),
             date_from,
             date_to,
+            None,
+            self.job.report_progress,
+            self.job.cancelled,
+            self.format_input.currentData(),
+            on_result=self.on_finished, on_error=self.on_error, long_running=True
         )
+
+    def cancel_job(self):
+        if self.job is not None:
+            self.job.cancel()
+            self.cancel_button.setEnabled(False)
+            self.progress_label.setText("Przerywanie...")
+
+    def reject(self):
+        # Okno zamykane dopiero po zakończeniu zadania w tle
+        if self.job is not None:
+            self.cancel_job()
+            return
+        super().reject()
+
+    def on_progress(self, rows, bytes_written):
+        rows_text = f"{rows:,}".replace(",", " ")
+        self.progress_label.setText(f"Przetworzono {rows_text} wierszy, zapisano {bytes_written / 1024:.1f} KB")
+
+    def on_finished(self, message):
+        self.job = None
         self.show_notification(QMessageBox.Icon.Information, "Raport", message)
         self.accept()
 
+    def on_error(self, message):
+        self.job = None
+        self.submit_button.setEnabled(True)
+        self.cancel_button.setEnabled(True)
+        self.cancel_button.setText("Anuluj")
+        self.progress_bar.setVisible(False)
+        self.progress_label.setText("")
+        self.show_notification(QMessageBox.Icon.Warning, "Błąd", message)
+
 class UserManagementDialog(BaseDialog):
     def __init__(self, parent=None):
         super().__init__("Zarządzanie Użytkownikami", parent)
@@ -645,10 +868,17 @@ class UserManagementDialog(BaseDialog):
             )
             return
             
-        success, message = self.parent().system.dodaj_pracownika(
-            login, password, imie, nazwisko, stanowisko
+        # Szyfrowanie hasła (bcrypt) wykonywane w tle
+        self.add_button.setEnabled(False)
+        self.parent().service.submit(
+            self.parent().system.dodaj_pracownika,
+            login, password, imie, nazwisko, stanowisko,
+            on_result=self.on_user_added, on_error=self.on_add_error,
+            on_done=lambda: self.add_button.setEnabled(True)
         )
-        
+
+    def on_user_added(self, result):
+        success, message = result
         if success:
             self.show_notification(
                 QMessageBox.Icon.Information,
@@ -668,6 +898,9 @@ class UserManagementDialog(BaseDialog):
                 message
             )
 
+    def on_add_error(self, message):
+        self.show_notification(QMessageBox.Icon.Warning, "Błąd", message)
+
 class StatusPanel(CardWidget):
     status_keys = ["status", "liczba_klientow", "aktywne_opaski", "data"]
     friendly_names = {
@@ -708,6 +941,62 @@ class StatusPanel(CardWidget):
                 self.status_widgets[key].setText(f"{friendly_name}: {value}")
 
 
+class PerformancePanel(CardWidget):
+    operations = ["obsluz_wejscie", "obsluz_wyjscie", "monitoruj_status", "pobierz_statystyki",
+                  "obsluz_raport", "zaloguj_uzytkownika"]
+    friendly_names = {
+        "obsluz_wejscie": "Wejście",
+        "obsluz_wyjscie": "Wyjście",
+        "monitoruj_status": "Status",
+        "pobierz_statystyki": "Statystyki",
+        "obsluz_raport": "Raport",
+        "zaloguj_uzytkownika": "Logowanie",
+    }
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.layout = QVBoxLayout(self)
+
+        header_layout = QHBoxLayout()
+        self.title_label = QLabel("Wydajność", self)
+        self.title_label.setStyleSheet(f"""
+            font-size: 16px;
+            font-weight: bold;
+            color: {ACCENT_COLOR};
+            background-color: {CARD_BG};
+        """)
+        self.dump_button = QPushButton("Zapisz pomiary", self)
+        self.dump_button.setStyleSheet(f"""
+            QPushButton {{
+                background-color: {CARD_BG};
+                color: {ACCENT_COLOR};
+                border: 1px solid {ACCENT_COLOR};
+                border-radius: 4px;
+                padding: 2px 8px;
+            }}
+        """)
+        header_layout.addWidget(self.title_label)
+        header_layout.addStretch(1)
+        header_layout.addWidget(self.dump_button)
+        self.layout.addLayout(header_layout)
+
+        self.operation_widgets = {}
+        for key in self.operations:
+            label = QLabel(f"{self.friendly_names[key]}: --", self)
+            label.setStyleSheet(f"font-size: 13px; background-color: {CARD_BG}; color: {TEXT_COLOR};")
+            self.layout.addWidget(label)
+            self.operation_widgets[key] = label
+
+        self.layout.addStretch(1)
+
+    def update_metrics(self, summary):
+        for key, metrics in summary.items():
+            if key in self.operation_widgets:
+                self.operation_widgets[key].setText(
+                    f"{self.friendly_names[key]}: {metrics['liczba']}×, "
+                    f"p50 {metrics['p50_ms']:g} ms, p95 {metrics['p95_ms']:g} ms, maks. {metrics['maks_ms']:.1f} ms"
+                )
+
 class SidebarButton(QPushButton):
     def __init__(self, text, parent=None):
         super().__init__(text, parent)
@@ -746,9 +1035,12 @@ class MainWindow(QMainWindow):
         super().__init__()
         self.system = SystemObslugi()
         self.system.inicjalizuj_baze_danych()
+        self.service = BackgroundService(self.system, self)
+        self.client_import_running = False
         self.screen_geometry = screen_geometry
         self.init_ui()
         self.init_timer()
+        self.init_events()
 
     def init_ui(self):
         self.setWindowTitle("PoolPro")
@@ -809,12 +1101,12 @@ class MainWindow(QMainWindow):
             qproperty-alignment: AlignCenter;
         """)
         
-        login_button = ModernButton("Zaloguj się", None)
-        login_button.clicked.connect(self.show_auth_dialog)
+        self.login_button = ModernButton("Zaloguj się", None)
+        self.login_button.clicked.connect(self.show_auth_dialog)
         
         login_card_layout.addWidget(logo_label)
         login_card_layout.addWidget(subtitle)
-        login_card_layout.addWidget(login_button)
+        login_card_layout.addWidget(self.login_button)
         
         login_layout.addStretch(2)
         login_layout.addWidget(login_card, alignment=Qt.AlignmentFlag.AlignCenter)
@@ -858,6 +1150,7 @@ class MainWindow(QMainWindow):
             ("Rejestruj wejście", self.show_client_registration),
             ("Skanuj opaskę", self.show_checkout_dialog),
             ("Raporty", self.show_report_dialog),
+            ("Import klientów", self.show_client_import),
             ("Zarządzanie użytkownikami", self.show_user_management)
         ]
         
@@ -881,9 +1174,15 @@ class MainWindow(QMainWindow):
         
         self.content_stack.addWidget(main_page)
         
+        panels_layout = QHBoxLayout()
         self.status_panel = StatusPanel()
         self.status_panel.setMaximumHeight(200)
-        self.content_layout.addWidget(self.status_panel)
+        self.performance_panel = PerformancePanel()
+        self.performance_panel.setMaximumHeight(200)
+        self.performance_panel.dump_button.clicked.connect(self.dump_performance)
+        panels_layout.addWidget(self.status_panel, 1)
+        panels_layout.addWidget(self.performance_panel, 1)
+        self.content_layout.addLayout(panels_layout)
         
         self.dashboard_stack = QStackedWidget()
         self.content_layout.addWidget(self.dashboard_stack, 1)
@@ -908,21 +1207,22 @@ class MainWindow(QMainWindow):
         
         stats_grid = QGridLayout()
         
-        stats = self.system.pobierz_statystyki()
+        # Wartości wczytywane są w tle, po zbudowaniu strony
+        self.stats_value_labels = {}
         item_counter = 0
-        for key, value in stats.items():
-            title = self.stats_friendly_names.get(key, key)
+        for key, title in self.stats_friendly_names.items():
             card = CardWidget()
             card_layout = QVBoxLayout(card)
             
             title_label = QLabel(title)
             title_label.setStyleSheet(f"font-size: 14px; color: {TEXT_COLOR}; background-color: {CARD_BG};")
             
-            value_label = QLabel(f"{value} zł")
+            value_label = QLabel("-- zł")
             value_label.setStyleSheet(f"font-size: 28px; font-weight: bold; color: {ACCENT_COLOR}; background-color: {CARD_BG};")
             
             card_layout.addWidget(title_label)
             card_layout.addWidget(value_label)
+            self.stats_value_labels[key] = value_label
             
             row, col = divmod(item_counter, 2)
             item_counter += 1
@@ -937,6 +1237,7 @@ class MainWindow(QMainWindow):
             qproperty-alignment: AlignRight;
         """)
         refresh_label.setObjectName("refresh_label")
+        self.refresh_label = refresh_label
         
         dashboard_layout.addWidget(welcome_label)
         dashboard_layout.addLayout(stats_grid)
@@ -946,98 +1247,120 @@ class MainWindow(QMainWindow):
         self.dashboard_stack.addWidget(dashboard_page)
 
     def init_timer(self):
-        # Timer for status updates (every second)
+        # Clock tick (every second) - no database access
         self.timer = QTimer(self)
-        self.timer.timeout.connect(self.update_status)
+        self.timer.timeout.connect(self.update_clock)
         self.timer.start(1000)
+        self.current_day = datetime.now().date()
         
-        # Timer for statistics updates (every minute)
-        self.stats_timer = QTimer(self)
-        self.stats_timer.timeout.connect(self.update_statistics)
-        self.stats_timer.start(60000)
+        # Periodic reconciliation with changes made at other desks
+        self.reconcile_timer = QTimer(self)
+        self.reconcile_timer.timeout.connect(self.reconcile)
+        self.reconcile_timer.start(SystemObslugi.OKRES_UZGADNIANIA_LICZNIKOW * 1000)
+
+        # Timing summary is kept in memory - cheap enough to read on the GUI thread
+        self.performance_timer = QTimer(self)
+        self.performance_timer.timeout.connect(self.update_performance)
+        self.performance_timer.start(5000)
+
+    def init_events(self):
+        """
+        Subskrybuje zdarzenia domenowe, na które reaguje pulpit
+        """
+        self.events = DomainEventBridge(self.system.zdarzenia, [
+            ZDARZENIE_KLIENT_ZAREJESTROWANY,
+            ZDARZENIE_PLATNOSC_ZAREJESTROWANA,
+            ZDARZENIE_OPASKA_ZWOLNIONA,
+        ], self)
+        self.events.event_received.connect(self.on_domain_event)
+
+    def on_domain_event(self, event_type, data):
+        if event_type == ZDARZENIE_PLATNOSC_ZAREJESTROWANA:
+            self.refresh_dashboard_stats()
+        else:
+            self.update_status()
+
+    def update_clock(self):
+        now = datetime.now()
+        self.status_panel.update_status({"data": now.strftime("%Y-%m-%d %H:%M:%S")})
+        # Daily revenue starts from zero at midnight
+        if now.date() != self.current_day:
+            self.current_day = now.date()
+            self.refresh_dashboard_stats()
+
+    def reconcile(self):
+        # Payments taken at other desks publish no events in this process
+        self.update_status()
+        self.refresh_dashboard_stats()
 
     def update_status(self):
         if self.status_panel:
-            status = self.system.monitoruj_status()
-            self.status_panel.update_status(status)
-            
-    def update_statistics(self):
-        # Only update if we're on the dashboard page
-        if self.content_stack.currentIndex() == 1 and self.dashboard_stack.currentIndex() == 0:
-            self.refresh_dashboard_stats()
+            self.service.submit_coalesced(
+                "status", self.system.monitoruj_status,
+                on_result=self.status_panel.update_status
+            )
+
+    def update_performance(self):
+        self.performance_panel.update_metrics(self.system.pomiary.podsumowanie())
+
+    def dump_performance(self):
+        default_name = f"pomiary_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        path, _ = QFileDialog.getSaveFileName(self, "Zapisz pomiary", default_name, "Pliki JSON (*.json)")
+        if not path:
+            return
+        try:
+            self.system.pomiary.zrzuc(path)
+        except OSError as e:
+            self.show_notification(QMessageBox.Icon.Warning, "Błąd", f"Nie udało się zapisać pomiarów: {e}")
+            return
+        self.show_notification(QMessageBox.Icon.Information, "Pomiary", f"Pomiary zapisano w pliku {path}")
 
     def refresh_dashboard_stats(self):
+        """
+        Zleca pobranie statystyk w tle
+        """
+        self.service.submit_coalesced(
+            "stats", self.system.pobierz_statystyki,
+            on_result=self.apply_dashboard_stats
+        )
+
+    def apply_dashboard_stats(self, stats):
         """
         Aktualizuje statystyki na pulpicie
         """
-        # Get current dashboard page
-        dashboard_page = self.dashboard_stack.widget(0)
-        if not dashboard_page:
-            return
-        
-        # Look for the stats grid in the layout
-        stats_grid = None
-        for i in range(dashboard_page.layout().count()):
-            item = dashboard_page.layout().itemAt(i)
-            if isinstance(item, QGridLayout):
-                stats_grid = item
-                break
-        
-        if not stats_grid:
-            return
+        for key, value_label in self.stats_value_labels.items():
+            if key in stats:
+                value_label.setText(f"{stats[key]} zł")
         
-        # Get updated statistics
-        stats = self.system.pobierz_statystyki()
-        
-        # Update each card with new data
-        for i in range(stats_grid.count()):
-            widget_item = stats_grid.itemAt(i)
-            if not widget_item:
-                continue
-                
-            card = widget_item.widget()
-            if not card or not isinstance(card, CardWidget):
-                continue
-                
-            # Find the key from the card's title label
-            card_layout = card.layout()
-            for j in range(card_layout.count()):
-                title_label = card_layout.itemAt(0).widget()
-                value_label = card_layout.itemAt(1).widget()
-                
-                if not title_label or not value_label:
-                    continue
-                
-                # Find the key by matching the title label text
-                found_key = None
-                for key, friendly_name in self.stats_friendly_names.items():
-                    if title_label.text() == friendly_name:
-                        found_key = key
-                        break
-                
-                if found_key and found_key in stats:
-                    value_label.setText(f"{stats[found_key]} zł")
-                
-                break
-        
-        # Update the refresh timestamp
-        for i in range(dashboard_page.layout().count()):
-            item = dashboard_page.layout().itemAt(i)
-            if item.widget() and item.widget().objectName() == "refresh_label":
-                refresh_label = item.widget()
-                refresh_label.setText(f"Ostatnia aktualizacja: {datetime.now().strftime('%H:%M:%S')}")
-                break
+        self.refresh_label.setText(f"Ostatnia aktualizacja: {datetime.now().strftime('%H:%M:%S')}")
 
     def show_auth_dialog(self):
         dialog = AuthorizationDialog(self)
         if dialog.exec() == QDialog.DialogCode.Accepted:
             login, password = dialog.get_credentials()
-            if self.system.zaloguj_uzytkownika(login, password):
-                self.content_stack.setCurrentIndex(1)
-                self.menu_buttons[0].setChecked(True)
-                self.show_dashboard()
-            else:
-                self.show_notification(QMessageBox.Icon.Warning, "Błąd logowania", "Nieprawidłowe dane logowania")
+            # Weryfikacja bcrypt trwa, więc wykonywana jest w tle
+            self.login_button.setEnabled(False)
+            self.login_button.setText("Logowanie...")
+            self.service.submit(
+                self.system.zaloguj_uzytkownika, login, password,
+                on_result=self.on_login_finished, on_error=self.on_login_error,
+                on_done=self.on_login_done
+            )
+
+    def on_login_finished(self, logged_in):
+        if logged_in:
+            self.content_stack.setCurrentIndex(1)
+            self.menu_buttons[0].setChecked(True)
+            self.show_dashboard()
+        else:
+            self.show_notification(QMessageBox.Icon.Warning, "Błąd logowania", "Nieprawidłowe dane logowania")
+
+    def on_login_error(self, message):
+        self.show_notification(QMessageBox.Icon.Warning, "Błąd logowania", message)
+
+    def on_login_done(self):
+        self.login_button.setEnabled(True)
+        self.login_button.setText("Zaloguj się")
 
     def show_dashboard(self):
         sender = self.sender()
@@ -1048,6 +1371,7 @@ class MainWindow(QMainWindow):
         # If dashboard is already created, refresh it
         if self.dashboard_stack.count() > 0:
             self.refresh_dashboard_stats()
+            self.update_status()
         
         self.dashboard_stack.setCurrentIndex(0)
 
@@ -1101,8 +1425,54 @@ class MainWindow(QMainWindow):
         if sender in self.menu_buttons:
             for button in self.menu_buttons:
                 button.setChecked(button == sender)
-                
-        ReportDialog(self).exec()
+
+        # Okno niemodalne - kilka raportów może być generowanych jednocześnie
+        dialog = ReportDialog(self)
+        dialog.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
+        dialog.show()
+
+    def show_client_import(self):
+        sender = self.sender()
+        if sender in self.menu_buttons:
+            for button in self.menu_buttons:
+                button.setChecked(button == sender)
+
+        if not (self.system.zalogowany_pracownik and self.system.zalogowany_pracownik.stanowisko == "Kierownik"):
+            self.show_notification(QMessageBox.Icon.Warning, "Brak dostępu",
+                                 "Tylko kierownicy mogą importować klientów.")
+            return
+
+        if self.client_import_running:
+            self.show_notification(QMessageBox.Icon.Information, "Import klientów", "Import jest już w toku.")
+            return
+
+        path, _ = QFileDialog.getOpenFileName(self, "Import klientów", "", "Pliki CSV (*.csv);;Wszystkie pliki (*)")
+        if not path:
+            return
+
+        # Import dużego pliku trwa - wykonywany w tle, paczkami
+        self.client_import_running = True
+        self.service.submit(
+            self.system.importuj_klientow, path,
+            on_result=self.on_client_import_finished, on_error=self.on_client_import_error,
+            on_done=self.on_client_import_done, long_running=True
+        )
+
+    def on_client_import_finished(self, summary):
+        message = f"Zaimportowano klientów: {summary['zaimportowano']}\nOdrzucono wierszy: {summary['odrzucono']}"
+        if summary["odrzucone"]:
+            details = "\n".join(f"Wiersz {line}: {reason}" for line, reason in summary["odrzucone"][:10])
+            message += f"\n\n{details}"
+            if summary["odrzucono"] > 10:
+                message += f"\n... i {summary['odrzucono'] - 10} więcej"
+        self.show_notification(QMessageBox.Icon.Information, "Import klientów", message)
+        self.update_status()
+
+    def on_client_import_error(self, message):
+        self.show_notification(QMessageBox.Icon.Warning, "Błąd importu", message)
+
+    def on_client_import_done(self):
+        self.client_import_running = False
 
     def show_user_management(self):
         sender = self.sender()
@@ -1122,8 +1492,20 @@ class MainWindow(QMainWindow):
         self.content_stack.setCurrentIndex(0)
         self.show_notification(QMessageBox.Icon.Information, "Wylogowano", "Pomyślnie wylogowano z systemu")
 
+    def closeEvent(self, event):
+        self.timer.stop()
+        self.reconcile_timer.stop()
+        self.performance_timer.stop()
+        self.events.close()
+        for dialog in self.findChildren(ReportDialog):
+            dialog.cancel_job()
+        self.service.shutdown()
+        self.system.zamknij()
+        super().closeEvent(event)
+
 
 if __name__ == '__main__':
+    wlacz_dziennik_wolnych_zapytan()
     app = QApplication(sys.argv)
     window = MainWindow(app.primaryScreen().availableGeometry())
     window.show()
@@ -0,0 +1,74 @@
+import argparse
+import json
+import os
+import tempfile
+from datetime import date, datetime, timedelta
+
+from SystemObslugi import SystemObslugi
+from classes.Recepcjonista import Recepcjonista
+from classes.Symulator import Symulator, ZegarSymulacji
+
+
+def najblizsza_sobota():
+    dzisiaj = date.today()
+    return dzisiaj + timedelta(days=(5 - dzisiaj.weekday()) % 7)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Symulacja dnia pracy pływalni na SystemObslugi.")
+    parser.add_argument("--dzien", type=date.fromisoformat, default=najblizsza_sobota(), help="Symulowany dzień (RRRR-MM-DD)")
+    parser.add_argument("--przyjscia", type=float, default=300, help="Liczba wejść w najbardziej obleganej godzinie")
+    parser.add_argument("--pobyt", type=float, default=90, help="Średni czas pobytu w minutach")
+    parser.add_argument("--stanowiska", type=int, default=4, help="Liczba stanowisk recepcji")
+    parser.add_argument("--odswiezanie", type=int, default=60, help="Okres odświeżania pulpitu na stanowisku (s)")
+    parser.add_argument("--raporty", type=int, default=3600, help="Okres generowania raportów (s)")
+    parser.add_argument("--przyspieszenie", type=float, default=None,
+                        help="Sekundy symulacji na sekundę rzeczywistą (domyślnie bez przerw)")
+    parser.add_argument("--klienci", type=int, default=20000, help="Liczba klientów w bazie")
+    parser.add_argument("--opaski", type=int, default=1500, help="Liczba opasek")
+    parser.add_argument("--transakcje", type=int, default=500000, help="Liczba transakcji historycznych")
+    parser.add_argument("--ziarno", type=int, default=None, help="Ziarno generatora liczb losowych")
+    parser.add_argument("--wynik", help="Plik JSON z wynikami")
+    args = parser.parse_args()
+
+    zegar = ZegarSymulacji(datetime.combine(args.dzien, datetime.min.time()))
+    system = SystemObslugi(zegar=zegar)
+    katalog_roboczy = os.getcwd()
+    with tempfile.TemporaryDirectory() as katalog:
+        # Raporty i paragony zapisywane są w katalogu bieżącym
+        os.chdir(katalog)
+        try:
+            system.inicjalizuj_baze_danych(os.path.join(katalog, "symulacja.db"))
+            system.generuj_dane_testowe(args.klienci, args.opaski, args.transakcje, dni=365, ziarno=args.ziarno)
+            system.zalogowany_pracownik = Recepcjonista(1, "admin", "Piotr", "Zielinski", "Kierownik")
+            cursor = system.conn.cursor()
+            cursor.execute("SELECT imie, nazwisko, wiek, identyfikator FROM Klient")
+            klienci = cursor.fetchall()
+
+            symulator = Symulator(
+                system, zegar, args.dzien, ziarno=args.ziarno,
+                przyjscia_na_godzine=args.przyjscia, sredni_pobyt_min=args.pobyt,
+                stanowiska=args.stanowiska, okres_odswiezania_s=args.odswiezanie,
+                okres_raportow_s=args.raporty, przyspieszenie=args.przyspieszenie
+            )
+            wynik = symulator.uruchom(klienci)
+        finally:
+            system.zamknij()
+            os.chdir(katalog_roboczy)
+
+    print(f"Zdarzenia: {wynik['zdarzenia']} w {wynik['czas_rzeczywisty_s']} s, odrzucone wejścia: {wynik['odrzucone_wejscia']}")
+    for operacja, pomiar in wynik["operacje"].items():
+        print(
+            f"{operacja:<16} {pomiar['liczba']:>7}  {pomiar['przepustowosc_na_s']:>9}/s  "
+            f"p50 {pomiar['p50_ms']:>8.3f} ms  p99 {pomiar['p99_ms']:>8.3f} ms"
+        )
+    blokada = wynik["oczekiwanie_na_blokade"]
+    print(f"Oczekiwanie na blokadę zapisu: łącznie {blokada['suma_ms']:.1f} ms, p50 {blokada['p50_ms']:.3f} ms, p99 {blokada['p99_ms']:.3f} ms")
+
+    if args.wynik:
+        with open(args.wynik, "w", encoding="utf-8") as plik:
+            json.dump(wynik, plik, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,8 +3,13 @@ from datetime import datetime
 import sqlite3
 import os
 import tempfile
+import threading
+import gzip
+import json
 
 from SystemObslugi import *
+from benchmarki import porownaj
+from classes.Symulator import Symulator, ZegarSymulacji, OPERACJA_WEJSCIE, OPERACJA_WYJSCIE
 
 class TestObliczanieOplat(unittest.TestCase):
     def test_oplata_za_godzine_w_dzien_roboczy(self):
@@ -56,6 +61,48 @@ class TestObliczanieOplat(unittest.TestCase):
         # 00:00-01:00 (weekend) = 16zł
         self.assertEqual(koszt, 30)
 
+    def test_oplata_za_pelny_tydzien(self):
+        """Test opłaty za pobyt trwający dokładnie tydzień"""
+        czas_wejscia = datetime(2025, 1, 7, 10, 0)  # Wtorek 10:00
+        czas_wyjscia = datetime(2025, 1, 14, 10, 0)  # Wtorek 10:00
+        koszt = SystemObslugi().oblicz_koszt_pobytu(czas_wejscia, czas_wyjscia)
+        # 2 dni weekendowe po 24 * 16zł, 5 dni roboczych po 8 * 10zł + 16 * 14zł
+        self.assertEqual(koszt, 2 * 24 * 16 + 5 * (8 * 10 + 16 * 14))
+
+    def test_oplata_za_pobyt_wielotygodniowy(self):
+        """Test opłaty za pobyt dłuższy niż tydzień z niepełnymi godzinami"""
+        czas_wejscia = datetime(2025, 1, 10, 15, 30)  # Piątek 15:30
+        czas_wyjscia = datetime(2025, 1, 24, 17, 15)  # Piątek 17:15 dwa tygodnie później
+        koszt = SystemObslugi().oblicz_koszt_pobytu(czas_wejscia, czas_wyjscia)
+        # 2 pełne tygodnie od piątku 15:00 + piątek 15:00-18:00 (10zł + 14zł + 14zł)
+        self.assertEqual(koszt, 2 * 2288 + 38)
+
+    def test_oplata_za_pobyt_zerowy(self):
+        """Test opłaty gdy czas wyjścia nie jest późniejszy niż czas wejścia"""
+        czas = datetime(2025, 1, 7, 10, 0)
+        self.assertEqual(SystemObslugi().oblicz_koszt_pobytu(czas, czas), 0)
+
+    def test_oplaty_zbiorcze_zgodne_z_pojedynczymi(self):
+        """Test zgodności rozliczenia zbiorczego z pojedynczym"""
+        system = SystemObslugi()
+        czasy_wejscia = [
+            datetime(2025, 1, 7, 15, 30),
+            datetime(2025, 1, 7, 23, 0),
+            datetime(2025, 1, 10, 23, 0),
+            datetime(2025, 1, 10, 15, 30),
+            datetime(2025, 1, 7, 10, 0),
+        ]
+        czasy_wyjscia = [
+            datetime(2025, 1, 7, 17, 30),
+            datetime(2025, 1, 8, 1, 0),
+            datetime(2025, 1, 11, 1, 0),
+            datetime(2025, 1, 24, 17, 15),
+            datetime(2025, 1, 7, 9, 0),
+        ]
+        koszty = system.oblicz_koszty_pobytow(czasy_wejscia, czasy_wyjscia)
+        oczekiwane = [system.oblicz_koszt_pobytu(w, wy) for w, wy in zip(czasy_wejscia, czasy_wyjscia)]
+        self.assertEqual(list(koszty), oczekiwane)
+
 
 class TestGenerowanieRaportow(unittest.TestCase):
     @classmethod
@@ -91,6 +138,16 @@ class TestGenerowanieRaportow(unittest.TestCase):
         )
         """)
 
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS PrzychodDzienny (
+            dzien TEXT NOT NULL,
+            metodaPlatnosci TEXT NOT NULL,
+            suma REAL NOT NULL DEFAULT 0,
+            liczba INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (dzien, metodaPlatnosci)
+        ) WITHOUT ROWID
+        """)
+
         # Dodawanie testowych danych
         test_data = [
             (1, 50.0, "2025-01-07 10:00:00", "Gotówka", 1, 1),
@@ -105,6 +162,10 @@ class TestGenerowanieRaportow(unittest.TestCase):
         )
         conn.commit()
 
+        system = SystemObslugi()
+        system.conn = conn
+        system._odbuduj_przychody_dzienne()
+
     def test_generowanie_raportu_finansowego(self):
         """Test generowania raportu finansowego"""
         raport = Raport("2025-01-07", "finansowy")
@@ -142,6 +203,129 @@ class TestGenerowanieRaportow(unittest.TestCase):
         
         self.assertEqual(len(dane), 0)
 
+    def test_strumieniowy_eksport_raportu(self):
+        """Test strumieniowego eksportu raportu pobieranego paczkami"""
+        raport = Raport("2025-01-07", "statystyki")
+        wiersze = raport.strumieniuj_raport("2025-01-07", "2025-01-07", self.conn, rozmiar_paczki=1)
+
+        with tempfile.TemporaryDirectory() as katalog:
+            nazwa_pliku = os.path.join(katalog, "raport.csv")
+            liczba_wierszy = raport.eksportuj_dane(wiersze, nazwa_pliku)
+            with open(nazwa_pliku, encoding="utf-8") as plik:
+                linie = plik.read().splitlines()
+
+        self.assertEqual(liczba_wierszy, 4)
+        self.assertEqual(linie[0], "ID klienta,Łączna kwota wydana")
+        self.assertEqual(len(linie), 5)
+
+    def test_eksport_zglasza_postep_i_obsluguje_anulowanie(self):
+        """Test raportowania postępu eksportu i przerwania go na żądanie"""
+        raport = Raport("2025-01-07", "statystyki")
+        raport.ROZMIAR_PACZKI = 2
+        postep = []
+        anulowanie = threading.Event()
+
+        with tempfile.TemporaryDirectory() as katalog:
+            nazwa_pliku = os.path.join(katalog, "raport.csv")
+            raport.eksportuj_dane(
+                [(i, 10.0) for i in range(5)], nazwa_pliku,
+                postep=lambda wiersze, bajty: postep.append((wiersze, bajty))
+            )
+
+            # Anulowanie po pierwszej paczce
+            with self.assertRaises(RaportAnulowany):
+                raport.eksportuj_dane(
+                    [(i, 10.0) for i in range(5)], nazwa_pliku,
+                    postep=lambda wiersze, bajty: anulowanie.set(), anulowanie=anulowanie
+                )
+            plik_istnieje = os.path.exists(nazwa_pliku)
+
+        self.assertEqual([wiersze for wiersze, _ in postep], [2, 4, 5])
+        self.assertTrue(all(b1 <= b2 for (_, b1), (_, b2) in zip(postep, postep[1:])))
+        self.assertGreater(postep[-1][1], 0)
+        self.assertFalse(plik_istnieje)
+
+    def test_anulowanie_przerywa_zapytanie_raportu(self):
+        """Test przerwania zapytania raportu przed pobraniem pierwszego wiersza"""
+        raport = Raport("2025-01-07", "statystyki")
+        raport.KROKI_SPRAWDZANIA_ANULOWANIA = 1
+        anulowanie = threading.Event()
+        anulowanie.set()
+
+        with raport.przerywalne_zapytania(self.conn, anulowanie):
+            wiersze = raport.strumieniuj_raport("2025-01-07", "2025-01-07", self.conn, anulowanie=anulowanie)
+            self.assertRaises(RaportAnulowany, next, wiersze)
+
+        # Po wyjściu z bloku zapytania połączenia nie są już przerywane
+        self.assertEqual(len(list(raport.strumieniuj_raport("2025-01-07", "2025-01-07", self.conn))), 4)
+
+    def test_eksport_do_formatow_skompresowanych(self):
+        """Test eksportu raportu do CSV z kompresją gzip i do JSON Lines"""
+        raport = Raport("2025-01-07", "finansowy")
+        wiersze = [("2025-01-07", "gotówka", 50.0), ("2025-01-07", "karta", 15.0)]
+
+        with tempfile.TemporaryDirectory() as katalog:
+            plik_csv_gz = os.path.join(katalog, raport.nazwa_pliku("2025-01-07", "2025-01-07", "csv.gz"))
+            plik_jsonl = os.path.join(katalog, raport.nazwa_pliku("2025-01-07", "2025-01-07", "jsonl"))
+            raport.eksportuj_dane(wiersze, plik_csv_gz, format_pliku="csv.gz")
+            raport.eksportuj_dane(wiersze, plik_jsonl, format_pliku="jsonl")
+
+            with gzip.open(plik_csv_gz, "rt", encoding="utf-8") as plik:
+                linie_csv = plik.read().splitlines()
+            with open(plik_jsonl, encoding="utf-8") as plik:
+                rekordy = [json.loads(linia) for linia in plik]
+
+        self.assertTrue(plik_csv_gz.endswith("raport_finansowy_2025-01-07_do_2025-01-07.csv.gz"))
+        self.assertEqual(linie_csv, ["Data,Metoda płatności,Łączna kwota", "2025-01-07,gotówka,50.0", "2025-01-07,karta,15.0"])
+        self.assertEqual(rekordy[1], {"data": "2025-01-07", "metoda_platnosci": "karta", "laczna_kwota": 15.0})
+        self.assertRaises(ValueError, raport.nazwa_pliku, "2025-01-07", "2025-01-07", "xml")
+
+    def test_raport_finansowy_obejmuje_ostatni_dzien(self):
+        """Test uwzględnienia transakcji z dnia końcowego zakresu"""
+        raport = Raport("2025-01-07", "finansowy")
+        dane = raport._generuj_raport_finansowy("2025-01-07", "2025-01-07", self.conn)
+
+        self.assertEqual(sum(row[2] for row in dane), 345.0)
+
+    def test_filtrowanie_po_dacie_korzysta_z_indeksu(self):
+        """Test wykorzystania indeksów pokrywających przez zapytania raportów"""
+        system = SystemObslugi()
+        system.conn = sqlite3.connect(":memory:")
+        system._utworz_tabele()
+        cursor = system.conn.cursor()
+
+        def plan(zapytanie):
+            cursor.execute(f"EXPLAIN QUERY PLAN {zapytanie}", zakres_dni("2025-01-07", "2025-01-07"))
+            return " ".join(row[-1] for row in cursor.fetchall())
+
+        plan_statystyczny = plan(RAPORT_STATYSTYCZNY)
+        plan_finansowy = plan(RAPORT_FINANSOWY)
+        system.conn.close()
+
+        self.assertIn("COVERING INDEX idx_transakcja_data_klient", plan_statystyczny)
+        self.assertNotIn("SCAN", plan_statystyczny)
+        self.assertIn("SEARCH PrzychodDzienny USING PRIMARY KEY", plan_finansowy)
+        self.assertNotIn("TEMP B-TREE", plan_finansowy)
+
+    def test_platnosc_aktualizuje_przychod_dzienny(self):
+        """Test aktualizacji agregatu dziennego przy zapisie płatności"""
+        conn = sqlite3.connect(":memory:")
+        system = SystemObslugi()
+        system.conn = conn
+        system._utworz_tabele()
+
+        Transakcja(20.0, "2025-01-07 10:00:00", "gotówka", 1, 1).przetworz_platnosc(conn)
+        Transakcja(30.0, "2025-01-07 18:00:00", "gotówka", 2, 1).przetworz_platnosc(conn)
+        Transakcja(15.0, "2025-01-08 09:00:00", "karta", 1, 1).przetworz_platnosc(conn)
+
+        cursor = conn.cursor()
+        cursor.execute("SELECT dzien, metodaPlatnosci, suma, liczba FROM PrzychodDzienny ORDER BY dzien")
+        self.assertEqual(cursor.fetchall(), [
+            ("2025-01-07", "gotówka", 50.0, 2),
+            ("2025-01-08", "karta", 15.0, 1),
+        ])
+        conn.close()
+
 class TestAuthorization(unittest.TestCase):
     @classmethod
     def setUpClass(cls):
@@ -212,5 +396,493 @@ class TestAuthorization(unittest.TestCase):
         system.conn = self.conn
         self.assertFalse(system.zaloguj_uzytkownika("jan", "wrongpassword"))
 
+    def test_przeliczenie_hasla_po_zmianie_kosztu(self):
+        """Test podmiany skrótu hasła przy logowaniu po zmianie kosztu bcrypt"""
+        conn = sqlite3.connect(":memory:")
+        system = SystemObslugi(koszt_hasla=5)
+        system.conn = conn
+        system._utworz_tabele()
+        conn.execute(
+            "INSERT INTO Pracownik (login, haslo, imie, nazwisko, stanowisko) VALUES (?, ?, ?, ?, ?)",
+            ("ewa", system.szyfruj_haslo("haslo123"), "Ewa", "Nowak", "Recepcjonista")
+        )
+        conn.commit()
+
+        system.koszt_hasla = 4
+        self.assertTrue(system.zaloguj_uzytkownika("ewa", "haslo123"))
+        skrot = conn.execute("SELECT haslo FROM Pracownik WHERE login = 'ewa'").fetchone()[0]
+        conn.close()
+
+        self.assertEqual(system.koszt_skrotu(skrot), 4)
+        self.assertTrue(system.weryfikuj_haslo("haslo123", skrot))
+
+class TestObslugaKlienta(unittest.TestCase):
+    def setUp(self):
+        """Przygotowanie systemu z bazą w pamięci"""
+        self.katalog_roboczy = os.getcwd()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        os.chdir(self.temp_dir.name)
+
+        self.system = SystemObslugi()
+        self.system.conn = sqlite3.connect(":memory:")
+        self.system._utworz_tabele()
+        cursor = self.system.conn.cursor()
+        cursor.executemany(
+            "INSERT INTO Opaska (numerSeryjny, czasWejscia, czasWyjscia, klient_id) VALUES (?, NULL, NULL, NULL)",
+            [(1001,), (1002,)]
+        )
+        self.system.conn.commit()
+        self.system.pula_opasek.zaladuj(self.system.conn)
+        self.system.uzgodnij_liczniki()
+        self.system.zalogowany_pracownik = Recepcjonista(1, "jan", "Jan", "Kowalski", "Recepcjonista")
+
+    def tearDown(self):
+        """Sprzątanie po testach"""
+        self.system.kolejka_paragonow.zamknij()
+        self.system.conn.close()
+        os.chdir(self.katalog_roboczy)
+        self.temp_dir.cleanup()
+
+    def test_wydanie_opaski_z_puli(self):
+        """Test wydawania opasek z puli wolnych opasek"""
+        self.assertEqual(len(self.system.pula_opasek), 2)
+
+        self.system.obsluz_wejscie("Anna", "Nowak", 30, 90010112345)
+        self.system.obsluz_wejscie("Jan", "Nowak", 31, 90010112346)
+
+        self.assertEqual(len(self.system.pula_opasek), 0)
+        self.assertEqual(
+            self.system.obsluz_wejscie("Ewa", "Nowak", 32, 90010112347),
+            "Brak dostępnych opasek!"
+        )
+
+    def test_zwrot_opaski_do_puli(self):
+        """Test powrotu opaski do puli po jej dezaktywacji"""
+        self.system.obsluz_wejscie("Anna", "Nowak", 30, 90010112345)
+        self.system.obsluz_wejscie("Jan", "Nowak", 31, 90010112346)
+        opaska = OpaskaNFC(1001)
+        opaska.deaktywuj(self.system.conn, self.system.pula_opasek)
+
+        self.assertEqual(len(self.system.pula_opasek), 1)
+        self.assertIn("1001", self.system.obsluz_wejscie("Ewa", "Nowak", 32, 90010112347))
+
+    def test_wejscie_jest_atomowe(self):
+        """Test wycofania wydania opaski, gdy zapis klienta się nie powiedzie"""
+        wynik = self.system.obsluz_wejscie(None, "Nowak", 30, 90010112345)
+
+        self.assertTrue(wynik.startswith("Błąd bazy danych"))
+        cursor = self.system.conn.cursor()
+        cursor.execute("SELECT COUNT(*) FROM Opaska WHERE klient_id IS NOT NULL")
+        self.assertEqual(cursor.fetchone()[0], 0)
+        self.assertIn("1001", self.system.obsluz_wejscie("Anna", "Nowak", 30, 90010112345))
+
+    def test_wyjscie_rozlicza_i_zwalnia_opaske(self):
+        """Test zapisu płatności i zwolnienia opaski przy wyjściu klienta"""
+        self.system.obsluz_wejscie("Anna", "Nowak", 30, 90010112345)
+        wynik = self.system.obsluz_wyjscie("1001", "gotówka")
+        self.system.kolejka_paragonow.oczekuj()
+
+        self.assertIn("Należność", wynik)
+        cursor = self.system.conn.cursor()
+        cursor.execute("SELECT COUNT(*) FROM Transakcja")
+        self.assertEqual(cursor.fetchone()[0], 1)
+        cursor.execute("SELECT klient_id FROM Opaska WHERE numerSeryjny = 1001")
+        self.assertIsNone(cursor.fetchone()[0])
+        self.assertEqual(len(self.system.pula_opasek), 2)
+        self.assertTrue(os.path.exists(self.system.kolejka_paragonow.sciezka_paragonu(1)))
+
+    def test_archiwum_i_kolejka_wydruku_paragonow(self):
+        """Test zapisu paragonu każdej transakcji w archiwum i przekazania go drukarce"""
+        for pesel in [90010112345, 90010112346]:
+            self.system.obsluz_wejscie("Anna", "Nowak", 30, pesel)
+        self.system.obsluz_wyjscie("1001", "gotówka")
+        self.system.obsluz_wyjscie("1002", "Karta")
+        self.system.kolejka_paragonow.oczekuj()
+
+        kolejka = self.system.kolejka_paragonow
+        for identyfikator, metoda in [(1, "gotówka"), (2, "Karta")]:
+            with open(kolejka.sciezka_paragonu(identyfikator), encoding="utf-8") as plik:
+                tresc = plik.read()
+            self.assertIn(f"ID Transakcji: {identyfikator}", tresc)
+            self.assertIn(f"Metoda płatności: {metoda}", tresc)
+            self.assertEqual(kolejka.pobierz_do_wydruku(limit_czasu=1), (identyfikator, tresc))
+        self.assertIsNone(kolejka.pobierz_do_wydruku(limit_czasu=0))
+
+    def test_kolejka_wydruku_zachowuje_najnowsze_paragony(self):
+        """Test usuwania najstarszych paragonów z pełnej kolejki drukarki"""
+        kolejka = KolejkaParagonow(os.path.join(self.temp_dir.name, "paragony"), maks_do_wydruku=2)
+        for identyfikator in range(1, 5):
+            transakcja = Transakcja(10.0, "2025-01-07 10:00:00", "gotówka", 1, 1)
+            transakcja.identyfikatorTransakcji = identyfikator
+            kolejka.dodaj(transakcja)
+        kolejka.oczekuj()
+        kolejka.zamknij()
+
+        self.assertEqual(kolejka.pobierz_do_wydruku(limit_czasu=0)[0], 3)
+        self.assertEqual(kolejka.pobierz_do_wydruku(limit_czasu=0)[0], 4)
+        self.assertIsNone(kolejka.pobierz_do_wydruku(limit_czasu=0))
+        self.assertTrue(os.path.exists(kolejka.sciezka_paragonu(1)))
+
+    def test_kolejka_paragonow_dziala_po_bledzie_paragonu(self):
+        """Test kontynuacji pracy wątku paragonów po błędzie jednego paragonu"""
+        kolejka = KolejkaParagonow(os.path.join(self.temp_dir.name, "paragony"))
+        wadliwa = Transakcja(10.0, "2025-01-07 10:00:00", "gotówka", 1, 1)
+        wadliwa.identyfikatorTransakcji = 1
+        wadliwa.tresc_paragonu = lambda: 1 / 0
+        poprawna = Transakcja(10.0, "2025-01-07 10:00:00", "gotówka", 1, 1)
+        poprawna.identyfikatorTransakcji = 2
+
+        with self.assertLogs("classes.KolejkaParagonow", "ERROR"):
+            kolejka.dodaj(wadliwa)
+            kolejka.dodaj(poprawna)
+            wydruk = kolejka.pobierz_do_wydruku(limit_czasu=5)
+        kolejka.zamknij()
+
+        self.assertEqual(wydruk[0], 2)
+        self.assertFalse(os.path.exists(kolejka.sciezka_paragonu(1)))
+        self.assertTrue(os.path.exists(kolejka.sciezka_paragonu(2)))
+
+    def test_liczniki_statusu(self):
+        """Test aktualizacji liczników statusu przy wejściu i wyjściu klientów"""
+        self.system.obsluz_wejscie("Anna", "Nowak", 30, 90010112345)
+        self.system.obsluz_wejscie("Anna", "Nowak", 30, 90010112345)
+        self.system.obsluz_wyjscie("1001", "gotówka")
+
+        status = self.system.monitoruj_status()
+        self.assertEqual(status["liczba_klientow"], 1)
+        self.assertEqual(status["aktywne_opaski"], 1)
+
+        # Uzgodnienie z bazą nie zmienia poprawnie prowadzonych liczników
+        self.system.uzgodnij_liczniki()
+        self.assertEqual(self.system.liczba_klientow, 1)
+        self.assertEqual(self.system.aktywne_opaski, 1)
+
+    def test_publikowanie_zdarzen(self):
+        """Test publikowania zdarzeń domenowych po wejściu i wyjściu klienta"""
+        zdarzenia = []
+        for typ in [ZDARZENIE_KLIENT_ZAREJESTROWANY, ZDARZENIE_PLATNOSC_ZAREJESTROWANA, ZDARZENIE_OPASKA_ZWOLNIONA]:
+            self.system.zdarzenia.subskrybuj(typ, lambda typ, dane: zdarzenia.append((typ, dane)))
+
+        self.system.obsluz_wejscie("Anna", "Nowak", 30, 90010112345)
+        self.system.obsluz_wyjscie("1001", "gotówka")
+
+        self.assertEqual([typ for typ, _ in zdarzenia], [
+            ZDARZENIE_KLIENT_ZAREJESTROWANY,
+            ZDARZENIE_PLATNOSC_ZAREJESTROWANA,
+            ZDARZENIE_OPASKA_ZWOLNIONA,
+        ])
+        self.assertEqual(zdarzenia[0][1]["numer_opaski"], 1001)
+        self.assertEqual(zdarzenia[1][1]["metoda_platnosci"], "gotówka")
+
+    def test_pamiec_raportow_uniewaznia_zmieniony_okres(self):
+        """Test unieważniania zapamiętanych raportów obejmujących dzień nowej płatności"""
+        pamiec = self.system.pamiec_raportow
+        self.system.obsluz_raport("finansowy", "2020-01-01", "2020-01-31")
+        self.system.obsluz_raport("finansowy", "2020-02-01", "2020-02-29")
+        self.assertEqual(pamiec.pobierz("finansowy", "2020-01-01", "2020-01-31"), [])
+
+        # Płatność z opóźnieniem zaksięgowana w zamkniętym okresie
+        self.system.zegar = ZegarSymulacji(datetime(2020, 1, 15, 10, 0))
+        self.system.obsluz_wejscie("Anna", "Nowak", 30, 90010112345)
+        self.system.obsluz_wyjscie("1001", "gotówka")
+        self.system.zegar = datetime.now
+
+        self.assertIsNone(pamiec.pobierz("finansowy", "2020-01-01", "2020-01-31"))
+        self.assertEqual(pamiec.pobierz("finansowy", "2020-02-01", "2020-02-29"), [])
+
+    def test_pamiec_raportow_pomija_otwarty_okres(self):
+        """Test pomijania pamięci dla okresów obejmujących dzień bieżący"""
+        pamiec = self.system.pamiec_raportow
+        dzisiaj = datetime.now().strftime("%Y-%m-%d")
+        self.system.obsluz_raport("finansowy", dzisiaj, dzisiaj)
+        self.assertIsNone(pamiec.pobierz("finansowy", dzisiaj, dzisiaj))
+
+        # Płatność przyjęta na innym stanowisku (z pominięciem magistrali zdarzeń tego systemu)
+        with self.system.jednostka_pracy() as conn:
+            Transakcja(25.0, f"{dzisiaj} 10:00:00", "Karta", 90010112345, 1).przetworz_platnosc(conn)
+        self.system.obsluz_raport("finansowy", dzisiaj, dzisiaj)
+        with open(f"raport_finansowy_{dzisiaj}_do_{dzisiaj}.csv", encoding="utf-8") as plik:
+            self.assertIn("25.0", plik.read())
+
+        # Dzień bieżący według zegara systemu, także po jego podmianie
+        self.system.zegar = ZegarSymulacji(datetime(2020, 2, 10, 12, 0))
+        self.system.obsluz_raport("finansowy", "2020-02-01", "2020-02-29")
+        self.assertIsNone(pamiec.pobierz("finansowy", "2020-02-01", "2020-02-29"))
+
+    def test_import_klientow_z_csv(self):
+        """Test zbiorczego importu klientów z walidacją numerów PESEL"""
+        self.system.ROZMIAR_PACZKI_IMPORTU = 2
+        self.system.obsluz_wejscie("Anna", "Nowak", 30, 44051401359)
+        with open("klienci.csv", "w", encoding="utf-8") as plik:
+            plik.write(
+                "pesel,imie,nazwisko,wiek\n"
+                "44051401359,Anna,Kowalska,31\n"
+                "02070803628,Jan,Nowak,22\n"
+                "44051401358,Ewa,Nowak,40\n"
+                "02070803628,,Nowak,22\n"
+                "90090515836,Piotr,Wiśniewski,abc\n"
+                "90090515836,Piotr,Wiśniewski,34\n"
+            )
+
+        podsumowanie = self.system.importuj_klientow("klienci.csv")
+
+        self.assertEqual(podsumowanie["zaimportowano"], 3)
+        self.assertEqual(podsumowanie["odrzucono"], 3)
+        self.assertEqual([numer for numer, _ in podsumowanie["odrzucone"]], [4, 5, 6])
+        cursor = self.system.conn.cursor()
+        cursor.execute("SELECT nazwisko, wiek FROM Klient WHERE identyfikator = 44051401359")
+        self.assertEqual(cursor.fetchone(), ("Kowalska", 31))
+        self.assertEqual(self.system.liczba_klientow, 3)
+
+    def test_dodawanie_i_wycofywanie_opasek(self):
+        """Test zbiorczej rejestracji i wycofania zakresów opasek bez restartu"""
+        self.system.obsluz_wejscie("Anna", "Nowak", 30, 90010112345)
+
+        self.assertEqual(self.system.dodaj_opaski(1000, 1004), {"dodano": 3, "pominieto": 2})
+        self.assertEqual(len(self.system.pula_opasek), 4)
+
+        self.assertEqual(self.system.wycofaj_opaski(1000, 1002), {"wycofano": 2, "w_uzyciu": 1})
+        self.assertEqual(len(self.system.pula_opasek), 2)
+        self.assertIn("1003", self.system.obsluz_wejscie("Jan", "Nowak", 31, 90010112346))
+        self.assertRaises(ValueError, self.system.dodaj_opaski, 2000, 1999)
+
+    def test_generator_danych_testowych(self):
+        """Test generatora syntetycznych danych i odświeżenia struktur pochodnych"""
+        wynik = self.system.generuj_dane_testowe(klienci=50, opaski=20, transakcje=500, dni=14, ziarno=7)
+
+        self.assertEqual(wynik, {"klienci": 50, "opaski": 20, "transakcje": 500})
+        cursor = self.system.conn.cursor()
+        cursor.execute("SELECT identyfikator FROM Klient")
+        for (pesel,) in cursor.fetchall():
+            waliduj_pesel(pesel)
+        cursor.execute("SELECT COUNT(*), MIN(kwota) FROM Transakcja")
+        self.assertEqual(cursor.fetchone(), (500, 10.0))
+        cursor.execute("SELECT SUM(liczba) FROM PrzychodDzienny")
+        self.assertEqual(cursor.fetchone()[0], 500)
+        # Nowe opaski numerowane za istniejącymi 1001 i 1002
+        cursor.execute("SELECT MIN(numerSeryjny), MAX(numerSeryjny) FROM Opaska WHERE numerSeryjny > 1002")
+        self.assertEqual(cursor.fetchone(), (1003, 1022))
+        self.assertEqual(len(self.system.pula_opasek), 22)
+        self.assertEqual(self.system.liczba_klientow, 50)
+
+    def test_generator_danych_testowych_odrzuca_nieprawidlowe_parametry(self):
+        """Test odrzucenia parametrów generatora przed usunięciem indeksów"""
+        for parametry in [dict(dni=0), dict(dni=-3), dict(transakcje=-1), dict(klienci=-1), dict(opaski=-1)]:
+            argumenty = dict(klienci=10, opaski=5, transakcje=100, dni=7) | parametry
+            self.assertRaises(ValueError, self.system.generuj_dane_testowe, **argumenty)
+
+        cursor = self.system.conn.cursor()
+        cursor.execute("SELECT COUNT(*) FROM sqlite_master WHERE type = 'index' AND name LIKE 'idx_transakcja%'")
+        self.assertEqual(cursor.fetchone()[0], 2)
+        cursor.execute("SELECT COUNT(*) FROM Transakcja")
+        self.assertEqual(cursor.fetchone()[0], 0)
+
+    def test_zegar_symulacji(self):
+        """Test rozliczenia pobytu według podstawionego zegara systemu"""
+        zegar = ZegarSymulacji(datetime(2025, 1, 7, 10, 0))  # Wtorek 10:00
+        self.system.zegar = zegar
+        self.system.obsluz_wejscie("Anna", "Nowak", 30, 90010112345)
+        zegar.ustaw(datetime(2025, 1, 7, 11, 0))
+        wynik = self.system.obsluz_wyjscie("1001", "gotówka")
+        self.system.kolejka_paragonow.oczekuj()
+
+        self.assertIn("10", wynik)
+        cursor = self.system.conn.cursor()
+        cursor.execute("SELECT kwota, data FROM Transakcja")
+        self.assertEqual(cursor.fetchone(), (10.0, "2025-01-07 11:00:00"))
+
+    def test_symulacja_dnia(self):
+        """Test symulacji dnia pracy z kilkoma stanowiskami"""
+        katalog = self.temp_dir.name
+        zegar = ZegarSymulacji(datetime(2025, 1, 11))
+        system = SystemObslugi(zegar=zegar)
+        system.inicjalizuj_baze_danych(os.path.join(katalog, "symulacja.db"))
+        system.generuj_dane_testowe(klienci=200, opaski=100, transakcje=1000, dni=30, ziarno=3)
+        system.zalogowany_pracownik = self.system.zalogowany_pracownik
+        cursor = system.conn.cursor()
+        cursor.execute("SELECT imie, nazwisko, wiek, identyfikator FROM Klient")
+        klienci = cursor.fetchall()
+        cursor.execute("SELECT COUNT(*) FROM Opaska WHERE klient_id IS NOT NULL")
+        aktywne = cursor.fetchone()[0]
+
+        symulator = Symulator(system, zegar, datetime(2025, 1, 11).date(), ziarno=3,
+                              przyjscia_na_godzine=20, stanowiska=3, okres_odswiezania_s=600)
+        wynik = symulator.uruchom(klienci)
+        system.kolejka_paragonow.oczekuj()
+
+        wejscia = wynik["operacje"][OPERACJA_WEJSCIE]["liczba"]
+        self.assertGreater(wejscia, 0)
+        self.assertEqual(wynik["odrzucone_wejscia"], 0)
+        self.assertEqual(wynik["operacje"][OPERACJA_WYJSCIE]["liczba"], wejscia)
+        cursor.execute("SELECT COUNT(*) FROM Transakcja WHERE data LIKE '2025-01-1%'")
+        self.assertEqual(cursor.fetchone()[0], wejscia)
+        # Wszyscy symulowani klienci wyszli - aktywne pozostają tylko opaski z danych przykładowych
+        cursor.execute("SELECT COUNT(*) FROM Opaska WHERE klient_id IS NOT NULL")
+        self.assertEqual(cursor.fetchone()[0], aktywne)
+        system.zamknij()
+
+    def test_pomiary_czasu_operacji(self):
+        """Test zliczania wywołań i histogramów czasu operacji systemu"""
+        self.system.obsluz_wejscie("Anna", "Nowak", 30, 90010112345)
+        self.system.obsluz_wyjscie("1001", "gotówka")
+        self.system.obsluz_wyjscie("1001", "gotówka")
+        self.system.kolejka_paragonow.oczekuj()
+
+        podsumowanie = self.system.pomiary.podsumowanie()
+        self.assertEqual(podsumowanie["obsluz_wejscie"]["liczba"], 1)
+        self.assertEqual(podsumowanie["obsluz_wyjscie"]["liczba"], 2)
+        wyjscie = podsumowanie["obsluz_wyjscie"]
+        self.assertLessEqual(wyjscie["p50_ms"], wyjscie["p99_ms"])
+        self.assertLessEqual(wyjscie["p99_ms"], wyjscie["maks_ms"])
+
+        self.system.pomiary.zrzuc("pomiary.json")
+        with open("pomiary.json", encoding="utf-8") as plik:
+            zrzut = json.load(plik)
+        self.assertEqual(sum(zrzut["histogramy"]["obsluz_wyjscie"]), 2)
+        self.assertEqual(len(zrzut["histogramy"]["obsluz_wyjscie"]), len(zrzut["granice_ms"]) + 1)
+
+    def test_walidacja_pesel(self):
+        """Test walidacji cyfry kontrolnej i daty w numerze PESEL"""
+        self.assertEqual(waliduj_pesel("02070803628"), 2070803628)
+        self.assertEqual(waliduj_pesel(2070803628), 2070803628)
+        for pesel in ["0207080362", "02070803627", "02130803627", "abcdefghijk"]:
+            self.assertRaises(ValueError, waliduj_pesel, pesel)
+
+class TestPulaPolaczen(unittest.TestCase):
+    def setUp(self):
+        """Przygotowanie puli połączeń do pliku tymczasowego"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.pula = PulaPolaczen(os.path.join(self.temp_dir.name, "baza.db"), rozmiar=1)
+
+    def tearDown(self):
+        """Sprzątanie po testach"""
+        self.pula.zamknij()
+        self.temp_dir.cleanup()
+
+    def test_polaczenie_w_trybie_wal(self):
+        """Test konfiguracji trybu WAL i limitu oczekiwania na blokadę"""
+        conn = self.pula.polaczenie()
+        self.assertEqual(conn.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+        self.assertEqual(conn.execute("PRAGMA busy_timeout").fetchone()[0], 5000)
+
+    def test_polaczenia_per_watek(self):
+        """Test przydzielania osobnych połączeń wątkom i ich ponownego użycia"""
+        glowne = self.pula.polaczenie()
+        self.assertIs(self.pula.polaczenie(), glowne)
+
+        z_watku = []
+        def zadanie():
+            z_watku.append(self.pula.polaczenie())
+            self.pula.zwolnij()
+        watek = threading.Thread(target=zadanie)
+        watek.start()
+        watek.join()
+
+        self.assertIsNot(z_watku[0], glowne)
+        self.pula.zwolnij()
+        # Zwolnione połączenie wątku trafiło do puli i jest ponownie wydawane
+        self.assertIs(self.pula.polaczenie(), z_watku[0])
+
+    def test_stanowiska_nie_wydaja_tej_samej_opaski(self):
+        """Test wydawania opasek przez dwa systemy (stanowiska) pracujące na jednej bazie"""
+        sciezka = os.path.join(self.temp_dir.name, "wspolna.db")
+        stanowiska = [SystemObslugi(koszt_hasla=4) for _ in range(2)]
+        for system in stanowiska:
+            system.inicjalizuj_baze_danych(sciezka)
+            system.zalogowany_pracownik = Recepcjonista(1, "admin", "Piotr", "Zielinski", "Kierownik")
+        pierwsze, drugie = stanowiska
+
+        wynik_pierwszego = pierwsze.obsluz_wejscie("Anna", "Nowak", 30, 90010112345)
+        wynik_drugiego = drugie.obsluz_wejscie("Jan", "Nowak", 31, 2070803628)
+        self.assertNotEqual(wynik_pierwszego.rsplit(" ", 1)[-1], wynik_drugiego.rsplit(" ", 1)[-1])
+
+        # Opaska wycofana na jednym stanowisku nie jest wydawana na drugim
+        nastepna = min(drugie.pula_opasek.wolne)
+        pierwsze.wycofaj_opaski(nastepna, nastepna)
+        wynik = drugie.obsluz_wejscie("Ewa", "Nowak", 32, 90010112347)
+        self.assertNotIn(str(nastepna), wynik)
+
+        cursor = pierwsze.conn.cursor()
+        cursor.execute("""
+            SELECT klient_id, COUNT(*) FROM Opaska
+            WHERE klient_id IN (90010112345, 2070803628, 90010112347) GROUP BY klient_id
+        """)
+        self.assertEqual(sorted(cursor.fetchall()), [(2070803628, 1), (90010112345, 1), (90010112347, 1)])
+        for system in stanowiska:
+            system.zamknij()
+
+    def test_dziennik_wolnych_zapytan(self):
+        """Test zapisu wolnych zapytań z parametrami i planem wykonania"""
+        pula = PulaPolaczen(os.path.join(self.temp_dir.name, "sledzona.db"), prog_wolnych_zapytan_ms=0)
+        conn = pula.polaczenie()
+        conn.execute("CREATE TABLE Transakcja (kwota REAL, data TEXT)")
+        conn.executemany("INSERT INTO Transakcja VALUES (?, ?)", ((10.0, "2025-01-07 10:00:00") for _ in range(3)))
+
+        with self.assertLogs("poolpro.wolne_zapytania") as logi:
+            cursor = conn.cursor()
+            cursor.execute("SELECT SUM(kwota) FROM Transakcja WHERE DATE(data) = ?", ("2025-01-07",))
+            self.assertEqual(cursor.fetchone()[0], 30.0)
+        pula.zamknij()
+
+        self.assertIn("'2025-01-07'", logi.output[0])
+        self.assertIn("plan: SCAN Transakcja", logi.output[0])
+
+    def test_dziennik_wolnych_zapytan_ukrywa_dane_wrazliwe(self):
+        """Test pomijania skrótów haseł i danych osobowych w dzienniku wolnych zapytań"""
+        pula = PulaPolaczen(os.path.join(self.temp_dir.name, "sledzona.db"), prog_wolnych_zapytan_ms=0)
+        conn = pula.polaczenie()
+        for instrukcja in SCHEMAT:
+            conn.execute(instrukcja)
+        skrot = b"$2b$04$AzbuTajnySkrotHaslaPracownika"
+
+        with self.assertLogs("poolpro.wolne_zapytania") as logi:
+            conn.execute(DODAJ_PRACOWNIKA, ("ewa", skrot, "Ewa", "Nowak", "Recepcjonista"))
+            conn.execute(DODAJ_KLIENTA, (90010112345, "Anna", "Nowak", 30))
+            conn.execute("SELECT ? FROM Pracownik", (skrot,))
+        pula.zamknij()
+
+        dziennik = "\n".join(logi.output)
+        for tajne in ("AzbuTajny", "ewa", "90010112345", "Anna"):
+            self.assertNotIn(tajne, dziennik)
+        self.assertEqual(dziennik.count("parametry: <ukryte>"), 2)
+        self.assertIn("parametry: ('<bajty>',)", dziennik)
+
+    def test_dziennik_wolnych_zapytan_wylaczony(self):
+        """Test pominięcia pomiaru i planu, gdy dziennik nie ma handlera"""
+        pula = PulaPolaczen(os.path.join(self.temp_dir.name, "sledzona.db"), prog_wolnych_zapytan_ms=0)
+        conn = pula.polaczenie()
+        plany = []
+        conn.plan_zapytania = lambda sql, parametry=(): plany.append(sql)
+        # Uruchamiający testy mogą dodać własne handlery przechwytujące
+        handlery = dziennik_wolnych_zapytan.handlers
+        dziennik_wolnych_zapytan.handlers = handlery[:1]
+        self.addCleanup(setattr, dziennik_wolnych_zapytan, "handlers", handlery)
+
+        self.assertFalse(dziennik_wlaczony())
+        conn.execute("CREATE TABLE Transakcja (kwota REAL, data TEXT)")
+        conn.executemany("INSERT INTO Transakcja VALUES (?, ?)", ((10.0, "2025-01-07 10:00:00") for _ in range(3)))
+        self.assertEqual(conn.execute("SELECT SUM(kwota) FROM Transakcja").fetchone()[0], 30.0)
+        pula.zamknij()
+
+        self.assertEqual(plany, [])
+
+class TestBenchmarki(unittest.TestCase):
+    def test_porownaj_wykrywa_regresje(self):
+        """Test wykrywania regresji względem wyników bazowych z pominięciem szumu"""
+        def wyniki(**mediany):
+            return {"wyniki": {"10000": {operacja: {"mediana_ms": ms} for operacja, ms in mediany.items()}}}
+
+        bazowe = wyniki(obsluz_wejscie=1.0, obsluz_wyjscie=1.0, pobierz_statystyki=0.01, obsluz_raport=5.0)
+        teraz = wyniki(
+            obsluz_wejscie=1.4,        # wzrost w granicach tolerancji
+            obsluz_wyjscie=3.0,        # regresja
+            pobierz_statystyki=0.04,   # wzrost wielokrotny, ale poniżej progu szumu
+            nowa_operacja=100.0,       # brak wyniku bazowego
+        )
+
+        self.assertEqual(porownaj(teraz, bazowe, 0.5), [("10000", "obsluz_wyjscie", 1.0, 3.0)])
+        self.assertEqual(porownaj(teraz, {}, 0.5), [])
+        self.assertEqual(len(porownaj(teraz, bazowe, 0.2)), 2)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file